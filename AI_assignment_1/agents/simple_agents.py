@@ -1,5 +1,10 @@
 from env import *
-from agent import Agent
+from .agent import Agent
+
+try:
+    input = raw_input   # python 2 - input() would eval the line
+except NameError:
+    pass
 
 class Human(Agent):
     def __init__(self, world, name=None, init_vertex=1):
@@ -11,7 +16,7 @@ class Human(Agent):
 
     # get the next move from the user
     def get_next_move(self):
-        return raw_input("What is your next move?\n--NOP to no-op\n--T<#Vertex> to traverse to another vertex\nInput: ").upper()
+        return input("What is your next move?\n--NOP to no-op\n--T<#Vertex> to traverse to another vertex\nInput: ").upper()
 
 
 # A greedy agent
@@ -19,53 +24,77 @@ class Human(Agent):
 # to the next vertex with people to be rescued
 # OR to a shelter if it is carrying people
 # If there is no such path, do no-op.
+# the path is kept and followed on the next moves. it is computed again only if a road was blocked, people were
+# picked up (by any agent), the agent picked up or dropped off, or it left the path (the next vertex of the path is
+# not a neighbour of its vertex)
 class Greedy(Agent):
     def __init__(self, world, name=None, init_vertex=1):
         super(Greedy, self).__init__(world=world, name=name, init_vertex=init_vertex)
+        self._route = None          # the vertices of the path left to the destination, the next move first
+        self._route_key = None      # (world version, world pickups, carrying people) the path was computed for
 
     def do(self):
+        key = (self.observation.version, self.observation.pickups, self.get_people_in_car() > 0)
+        if self._route_key == key and self._route:
+            # moved to the next vertex of the path
+            if self._route[0] == self.vertex:
+                self._route = self._route[1:]
+            if self._route and self.observation.get_edge(self.vertex, self._route[0]):
+                return 'T{}'.format(str(self._route[0]))
+        self._route = self.find_route()
+        self._route_key = key
+        if self._route:
+            return 'T{}'.format(str(self._route[0]))
+        # No such path - do nop
+        return 'NOP'
+
+    # the shortest path to the closest shelter if it is carrying people, else to the closest house with people.
+    # return the vertices of the path (without the current vertex), or None if there is no such path
+    def find_route(self):
         curr_vertex = self.vertex
-        # run Dijsktra
-        distance_dict, path = self.observation.dijkstra(curr_vertex)
-        # removing its curr_vertex (because distance from v to v is 0 .. )
-        distance_dict.pop(curr_vertex, None)
+        # if the world keeps a shortest path table, read the paths from it (route_to_v gets no dicts)
+        distance_dict, path = None, None
+        if self.observation.get_path_table() is None:
+            # the shortest path tree of the world (repaired by the world when roads are blocked)
+            tree = self.observation.shortest_path_tree(curr_vertex)
+            distance_dict, path = tree.distance, tree.parent
 
         # if it is carrying people - look for the closet shelter
         if self.get_people_in_car() > 0:
-            traverse_to_shelter = self.traverse_to_v(self.observation.shelter_vertices, distance_dict, path)
-            if traverse_to_shelter is not False:
-                return traverse_to_shelter
+            return self.route_to_v(self.observation.shelter_vertices, distance_dict, path)
         # look for the closet house
-        else:
-            # filter house tags only with at least one person in it
-            self.observation.filter_empty_houses()
-            traverse_to_house = self.traverse_to_v(self.observation.house_vertices, distance_dict, path)
-            if traverse_to_house is not False:
-                return traverse_to_house
-                # No such path - do nop
-        return 'NOP'
+        # filter house tags only with at least one person in it
+        self.observation.filter_empty_houses()
+        return self.route_to_v(self.observation.house_vertices, distance_dict, path)
 
-    def traverse_to_v(self, v_tags, distance_dict, path):
+    def route_to_v(self, v_tags, distance_dict, path):
+        if distance_dict is None:
+            return self.route_to_v_by_table(v_tags, self.observation.get_path_table())
         # filter only distances of SHELTER/HOUSE vertices
-        filter_distance_dict = {k: distance_dict[k] for k in v_tags if k in distance_dict}
+        # (without its curr_vertex, because distance from v to v is 0 .. )
+        filter_distance_dict = {k: distance_dict[k] for k in v_tags if k in distance_dict and k != self.vertex}
         # if found unblocked shortest path
         if len(filter_distance_dict) > 0:
-            min_distance = min(filter_distance_dict.values())
-            vertices = filter_distance_dict.keys()
-            distances = filter_distance_dict.values()
-            # get key by its value(= in our case distance)
-            destination_tag = vertices[distances.index(min_distance)]
-            backtrack = path[destination_tag]
-            if backtrack is self.vertex:
-                # traverse straight to the shelter vertex
-                return 'T{}'.format(str(destination_tag))
-            while path[backtrack] is not self.vertex:
-                backtrack = path[backtrack]
-            return 'T{}'.format(str(backtrack))
+            # the closest one. ties go to the lowest vertex tag (not to the first in the order of the dict)
+            destination_tag = min((distance, v) for v, distance in filter_distance_dict.items())[1]
+            # backtrack from the destination to the current vertex
+            route = [destination_tag]
+            while path[route[0]] != self.vertex:
+                route.insert(0, path[route[0]])
+            return route
+
+        # No such path
+        return None
 
-        # No such path - do nop
-        else:
-            return False
+    # same as route_to_v, by the world's shortest path table. ties go to the lowest vertex tag
+    def route_to_v_by_table(self, v_tags, table):
+        reachable = [(table.distance(self.vertex, v), v) for v in v_tags if v != self.vertex]
+        reachable = [(distance, v) for distance, v in reachable if distance != INFINITY]
+        if len(reachable) > 0:
+            destination_tag = min(reachable)[1]
+            return table.path(self.vertex, destination_tag)
+        # No such path
+        return None
 
 # A Vandal agent
 # does V no-ops
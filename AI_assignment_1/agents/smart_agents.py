@@ -1,5 +1,5 @@
 from env import *
-from agent import Agent
+from .agent import Agent
 from search_tree import SearchTree
 
 # A greedy search agent, by h(n) = #unsaved people no matter what
@@ -25,25 +25,75 @@ class SmartAgent(Agent):
         return result
 
 
+# search_options are passed on to the SearchTree (graph_search, ...)
 class SmartGreedy(SmartAgent):
-    def __init__(self, world, name=None, init_vertex=1, bonus_vandal_records=None):
+    def __init__(self, world, name=None, init_vertex=1, bonus_vandal_records=None, **search_options):
         super(SmartGreedy, self).__init__(world=world, name=name, init_vertex=init_vertex, bonus_vandal_records=bonus_vandal_records)
-        self.search_tree = SearchTree(init_state=self.init_state, strategy='greedy', vandal_records=bonus_vandal_records)
+        self.search_tree = SearchTree(init_state=self.init_state, strategy='greedy', vandal_records=bonus_vandal_records, **search_options)
 
 
 # An agent using A* search, by f(n) = h(n) + g(n) where g(n) - time passed.
 class SmartAStar(SmartAgent):
-    def __init__(self, world, name=None, init_vertex=1, bonus_vandal_records=None):
+    def __init__(self, world, name=None, init_vertex=1, bonus_vandal_records=None, **search_options):
         super(SmartAStar, self).__init__(world=world, name=name, init_vertex=init_vertex, bonus_vandal_records=bonus_vandal_records)
-        self.search_tree = SearchTree(init_state=self.init_state, strategy='A*', vandal_records=bonus_vandal_records)
+        self.search_tree = SearchTree(init_state=self.init_state, strategy='A*', vandal_records=bonus_vandal_records, **search_options)
 
 
 
 
+# An agent using IDA* search - depth first iterations bounded by f(n) = h(n) + g(n)
+class SmartIDAStar(SmartAgent):
+    def __init__(self, world, name=None, init_vertex=1, bonus_vandal_records=None, **search_options):
+        super(SmartIDAStar, self).__init__(world=world, name=name, init_vertex=init_vertex, bonus_vandal_records=bonus_vandal_records)
+        self.search_tree = SearchTree(init_state=self.init_state, strategy='IDA*', vandal_records=bonus_vandal_records, **search_options)
+
+    def do(self):
+        result = self.search_tree.ida_search(self.world)
+        self.expands = self.search_tree.num_expands
+        return result
+
+
+# An anytime agent using ARA* search - weighted A* searches by f(n) = weight * h(n) + g(n), with a lower weight each
+# time, until time_budget seconds passed or the weight 1 search is done (it proves the solution optimal if the
+# heuristic is admissible)
+class SmartARAStar(SmartAgent):
+    def __init__(self, world, name=None, init_vertex=1, bonus_vandal_records=None, time_budget=None, **search_options):
+        super(SmartARAStar, self).__init__(world=world, name=name, init_vertex=init_vertex, bonus_vandal_records=bonus_vandal_records)
+        self.search_tree = SearchTree(init_state=self.init_state, strategy='ARA*', vandal_records=bonus_vandal_records, **search_options)
+        self.time_budget = time_budget
+
+    def do(self):
+        result = self.search_tree.anytime_search(self.world, time_budget=self.time_budget)
+        self.expands = self.search_tree.num_expands
+        return result
+
+
+# A real time A* agent. each decision searches a bounded lookahead (expand_limit expansions) from the current node,
+# commits to the best move and stores a learned h for the state it leaves, until a goal state is reached.
+# learning='RTA*' stores the f of the second best move (RTA*), learning='LRTA*' the f of the best one (LRTA*).
 class SmartRTA(SmartAgent):
-    def __init__(self, world, expand_limit, name=None, init_vertex=1, bonus_vandal_records=None):
+    def __init__(self, world, expand_limit, name=None, init_vertex=1, bonus_vandal_records=None, learning='RTA*',
+                 **search_options):
         super(SmartRTA, self).__init__(world=world, name=name, init_vertex=init_vertex, bonus_vandal_records=bonus_vandal_records)
-        self.search_tree = SearchTree(init_state=self.init_state, strategy='RTA', expand_limit=expand_limit, vandal_records=bonus_vandal_records)
-    #
-    # def do(self):
-    #     return self.search_tree.tree_sear
\ No newline at end of file
+        self.search_tree = SearchTree(init_state=self.init_state, strategy='RTA', expand_limit=expand_limit, vandal_records=bonus_vandal_records, **search_options)
+        self.learning = learning
+        self.decisions = 0
+
+    def do(self):
+        tree = self.search_tree
+        current = tree.root
+        result = current
+        while not tree.goal_test(current, self.world):
+            ranked = tree.lookahead(current, self.world)
+            self.decisions += 1
+            # no move to make
+            if len(ranked) == 0:
+                result = 'FAILURE'
+                break
+            best_f, best_child = ranked[0]
+            learned_f = ranked[1][0] if self.learning == 'RTA*' and len(ranked) > 1 else best_f
+            tree.learn(current, learned_f - tree.g(current))
+            current = best_child
+            result = current
+        self.expands = tree.num_expands
+        return result
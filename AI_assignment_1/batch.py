@@ -0,0 +1,134 @@
+import argparse
+import csv
+import json
+import os
+import resource
+import sys
+import traceback
+from multiprocessing import Pool
+
+from sim import run_search, silence_output
+
+FIELDS = ['graph_file', 'strategy', 'k', 'f', 'expand_limit', 'score', 'expands', 'performance', 'time', 'peak_rss_kb',
+          'error']
+
+
+# the graph files of the arguments - a directory stands for all the .txt files in it
+def list_graph_files(paths):
+    graph_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            graph_files.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.txt')))
+        else:
+            graph_files.append(path)
+    return graph_files
+
+
+# the configs of the grid graph_files x strategies x ks x expand_limits (RTA only). the performance of every f is
+# computed from the same run, so f is not a dimension of the runs
+def make_configs(graph_files, strategies, ks, expand_limits, search_options, path_table, time_budget,
+                 world_cache=None):
+    configs = []
+    for graph_file in graph_files:
+        for strategy in strategies:
+            limits = expand_limits if strategy.upper() == 'RTA' else [None]
+            for k in ks:
+                for expand_limit in limits:
+                    configs.append({'graph_file': graph_file,
+                                    'strategy': strategy,
+                                    'expand_limit': expand_limit,
+                                    'k': k,
+                                    'f': 0,
+                                    'search_options': dict(search_options, retain_tree=False),
+                                    'path_table': path_table,
+                                    'world_cache': world_cache,
+                                    'time_budget': time_budget})
+    return configs
+
+
+# run a config in a worker process. return a row for every f. a failed run gives rows with its error
+def run_config(job):
+    config, fs = job
+    row = {'graph_file': config['graph_file'], 'strategy': config['strategy'], 'k': config['k'],
+           'expand_limit': config['expand_limit']}
+    try:
+        result = run_search(config)
+        row.update({'score': result['score'], 'expands': result['expands'], 'time': result['time']})
+    except Exception:
+        row['error'] = traceback.format_exc().splitlines()[-1]
+    # every run has a process of its own, so the peak is the peak of the run
+    row['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rows = []
+    for f in fs:
+        f_row = dict(row, f=f)
+        if 'error' not in row:
+            f_row['performance'] = f * row['score'] + row['expands']
+        rows.append(f_row)
+    return rows
+
+
+# write rows to a .csv or a .jsonl file (by the extension of output), as soon as they come
+class RowWriter(object):
+    def __init__(self, output):
+        self.jsonl = output.endswith('.jsonl')
+        if self.jsonl:
+            self.file = open(output, 'w')
+        elif sys.version_info[0] == 2:
+            self.file = open(output, 'wb')    # the csv module of python 2 writes bytes
+        else:
+            self.file = open(output, 'w', newline='')
+        if not self.jsonl:
+            self.csv = csv.DictWriter(self.file, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.jsonl:
+            self.file.write(json.dumps(row, sort_keys=True) + '\n')
+        else:
+            self.csv.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+# run the grid in a process pool, a new process for every run, and write the rows to output
+def run(configs, fs, output, jobs=None):
+    writer = RowWriter(output)
+    pool = Pool(processes=jobs, initializer=silence_output, maxtasksperchild=1)
+    done = 0
+    try:
+        for rows in pool.imap_unordered(run_config, [(config, fs) for config in configs]):
+            for row in rows:
+                writer.write(row)
+            done += 1
+            print('{}/{} {} {} k={} expand_limit={}'.format(done, len(configs), rows[0]['graph_file'],
+                                                            rows[0]['strategy'], rows[0]['k'],
+                                                            rows[0]['expand_limit']))
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-g', '--graph_files', nargs='+', required=True)     # graph files or directories of them
+    parser.add_argument('-s', '--strategies', nargs='+', default=['GREEDY', 'A*', 'RTA'])
+    parser.add_argument('-k', '--slow_downs', type=float, nargs='+', default=[1])
+    parser.add_argument('-f', '--f_parameters', type=int, nargs='+', default=[-100])
+    parser.add_argument('-e', '--expand_limits', type=int, nargs='+', default=[11])   # for RTA
+    parser.add_argument('-o', '--output', default='results.csv')   # .csv or .jsonl
+    parser.add_argument('-j', '--jobs', type=int, default=None)    # worker processes (all cores)
+    parser.add_argument('-b', '--time_budget', type=float, default=None)  # for ARA*
+    parser.add_argument('--graph_search', action='store_true')
+    parser.add_argument('--path_table', action='store_true')
+    parser.add_argument('--world_cache', default=None)    # directory of the parsed records of graph files
+
+    args = parser.parse_args()
+    configs = make_configs(graph_files=list_graph_files(args.graph_files), strategies=args.strategies,
+                           ks=args.slow_downs, expand_limits=args.expand_limits,
+                           search_options={'graph_search': args.graph_search}, path_table=args.path_table,
+                           time_budget=args.time_budget, world_cache=args.world_cache)
+    run(configs=configs, fs=args.f_parameters, output=args.output, jobs=args.jobs)
@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from env import World
+from mapgen import random_int
+
+
+# write a random connected graph file: a random spanning tree plus extra random edges
+def write_random_graph(path, n, degree, seed):
+    rand = random.Random(seed)
+    edges = set()
+    for v in range(2, n + 1):
+        edges.add((random_int(rand, 1, v - 1), v))
+    extra = n * degree // 2 - len(edges)
+    while extra > 0:
+        a, b = random_int(rand, 1, n), random_int(rand, 1, n)
+        if a != b and (a, b) not in edges and (b, a) not in edges:
+            edges.add((a, b))
+            extra -= 1
+    with open(path, 'w') as graph_file:
+        graph_file.write('#V {}\n'.format(n))
+        for a, b in edges:
+            graph_file.write('#E {} {} W{}\n'.format(a, b, random_int(rand, 1, 10)))
+        for v in range(1, n + 1):
+            if rand.random() < 0.05:
+                graph_file.write('#V {} S\n'.format(v))
+            elif rand.random() < 0.3:
+                graph_file.write('#V {} P {}\n'.format(v, random_int(rand, 1, 5)))
+        graph_file.write('#D {}\n'.format(n))
+
+
+# average time of fn(source) over the given sources, in milliseconds
+def time_calls(fn, sources):
+    start = time.time()
+    for source in sources:
+        fn(source)
+    return (time.time() - start) * 1000.0 / len(sources)
+
+
+def run(sizes, degree, repeats, seed):
+    print('{:>8} {:>8} {:>12} {:>16} {:>20}'.format('V', 'E', 'dijkstra ms', 'super_dijk ms', 'nearest shelter ms'))
+    for n in sizes:
+        fd, path = tempfile.mkstemp(suffix='.txt')
+        os.close(fd)
+        try:
+            write_random_graph(path, n, degree, seed)
+            world = World(graph_file=path)
+        finally:
+            os.remove(path)
+        rand = random.Random(seed)
+        sources = [random_int(rand, 1, n) for _ in range(repeats)]
+        full = time_calls(world.dijkstra, sources)
+        loaded = time_calls(lambda s: world.super_dijkstra(source=s, people_collected=1), sources)
+        nearest = time_calls(lambda s: world.super_dijkstra(source=s, people_collected=1, targets=world.shelter_vertices,
+                                                            stop_at_first=True), sources)
+        print('{:>8} {:>8} {:>12.2f} {:>16.2f} {:>20.2f}'.format(n, len(world._edges), full, loaded, nearest))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=[1000, 5000, 10000, 50000])
+    parser.add_argument('-d', '--degree', type=int, default=4)      # average vertex degree
+    parser.add_argument('-r', '--repeats', type=int, default=5)     # sources timed per graph
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    run(sizes=args.sizes, degree=args.degree, repeats=args.repeats, seed=args.seed)
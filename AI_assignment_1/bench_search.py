@@ -0,0 +1,79 @@
+import argparse
+import os
+import tempfile
+from multiprocessing import Pool, TimeoutError
+
+from batch import run_config
+from mapgen import GENERATORS, generate
+from sim import silence_output
+
+
+# run a config in a process of its own, so the time and the peak memory are of this run only.
+# return its row, or None if it did not finish in timeout seconds
+def run_alone(config, f, timeout):
+    pool = Pool(processes=1, initializer=silence_output)
+    try:
+        return pool.apply_async(run_config, [(config, [f])]).get(timeout)[0]
+    except TimeoutError:
+        return None
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+ROW = '{:>9} {:>6} {:>8} {:>8} {:>9} {:>9} {:>9} {:>9} {:>10} {:>6} {:>8}'
+
+
+# for every kind of map and size, run every strategy with every heuristic on the same generated map. a strategy and
+# heuristic that timed out (or failed) on a size are not run on the larger ones. the time of a run is its expansions
+# times the cost of an expansion (ms/exp), which is mostly the cost of h
+def run(kinds, sizes, strategies, heuristics, expand_limit, f, timeout, seed, graph_search):
+    print(ROW.format('map', 'V', 'strategy', 'h', 'expands', 'time (s)', 'ms/exp', 'peak MB', 'nodes/s', 'score',
+                     'status'))
+    for kind in kinds:
+        fallen = set()      # the (strategy, heuristic) that fell over on a smaller map
+        for n in sizes:
+            fd, path = tempfile.mkstemp(suffix='.txt')
+            os.close(fd)
+            try:
+                generate(path, kind=kind, n=n, seed=seed)
+                for strategy in strategies:
+                    for heuristic in heuristics:
+                        if (strategy, heuristic) in fallen:
+                            continue
+                        config = {'graph_file': path, 'strategy': strategy,
+                                  'expand_limit': expand_limit if strategy.upper() == 'RTA' else None, 'k': 1, 'f': 0,
+                                  'search_options': {'graph_search': graph_search, 'retain_tree': False,
+                                                     'heuristic': heuristic},
+                                  'path_table': heuristic == 'mst', 'time_budget': None}
+                        row = run_alone(config, f, timeout)
+                        if row is None or 'error' in row:
+                            fallen.add((strategy, heuristic))
+                            status = 'timeout' if row is None else 'error'
+                            print(ROW.format(kind, n, strategy, heuristic, '-', '-', '-', '-', '-', '-', status))
+                            continue
+                        rate = row['expands'] / row['time'] if row['time'] > 0 else 0
+                        cost = row['time'] * 1000.0 / row['expands'] if row['expands'] > 0 else 0
+                        print(ROW.format(kind, n, strategy, heuristic, row['expands'], '{:.3f}'.format(row['time']),
+                                         '{:.3f}'.format(cost), '{:.1f}'.format(row['peak_rss_kb'] / 1024.0),
+                                         '{:.0f}'.format(rate), row['score'], 'ok'))
+            finally:
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-m', '--kinds', nargs='+', choices=sorted(GENERATORS), default=['grid', 'geometric', 'road'])
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=[10, 20, 40, 80, 160])
+    parser.add_argument('-s', '--strategies', nargs='+', default=['GREEDY', 'A*', 'RTA'])
+    parser.add_argument('-H', '--heuristics', nargs='+', choices=['dijkstra', 'shelter', 'mst'], default=['dijkstra'])
+    parser.add_argument('-e', '--expand_limit', type=int, default=11)   # for RTA
+    parser.add_argument('-f', '--f_parameter', type=int, default=-100)
+    parser.add_argument('--timeout', type=float, default=60)            # seconds a run may take
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--graph_search', action='store_true')
+
+    args = parser.parse_args()
+    run(kinds=args.kinds, sizes=args.sizes, strategies=args.strategies, heuristics=args.heuristics,
+        expand_limit=args.expand_limit,
+        f=args.f_parameter, timeout=args.timeout, seed=args.seed, graph_search=args.graph_search)
@@ -0,0 +1,65 @@
+import gzip
+import os
+import signal
+import time
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+FORMAT_VERSION = 1
+
+
+# when to snapshot a search - every interval seconds, or when asked to (by a signal). a signal can also ask to stop
+# the search after the snapshot is written, so a search that hits the time limit of its job slot goes on in the next
+class Checkpointer(object):
+    def __init__(self, path, interval=None):
+        self.path = path
+        self.interval = interval        # seconds between snapshots, None for snapshots only on request
+        self.last_save = time.time()
+        self.requested = False
+        self.stop = False               # stop the search after the next snapshot
+        self.saves = 0
+        self._handlers = None
+
+    # SIGUSR1 - snapshot and go on, SIGTERM - snapshot and stop. call from the main thread
+    def install_signal_handlers(self):
+        self._handlers = (signal.signal(signal.SIGUSR1, lambda signum, frame: self.request()),
+                          signal.signal(signal.SIGTERM, lambda signum, frame: self.request(stop=True)))
+
+    # the handlers from before install_signal_handlers
+    def remove_signal_handlers(self):
+        signal.signal(signal.SIGUSR1, self._handlers[0])
+        signal.signal(signal.SIGTERM, self._handlers[1])
+
+    def request(self, stop=False):
+        self.requested = True
+        self.stop = self.stop or stop
+
+    def due(self):
+        return self.requested or (self.interval is not None and time.time() - self.last_save >= self.interval)
+
+    def save(self, snapshot):
+        write_snapshot(self.path, snapshot)
+        self.last_save = time.time()
+        self.requested = False
+        self.saves += 1
+
+
+# write snapshot (a dict) as a gzipped pickle. it is written to a temporary file first and renamed over path,
+# so an interrupted write leaves the last snapshot whole
+def write_snapshot(path, snapshot):
+    snapshot = dict(snapshot, format=FORMAT_VERSION)
+    temp_path = path + '.tmp'
+    with gzip.open(temp_path, 'wb', compresslevel=1) as snapshot_file:
+        pickle.dump(snapshot, snapshot_file, pickle.HIGHEST_PROTOCOL)
+    os.rename(temp_path, path)
+
+
+def read_snapshot(path):
+    with gzip.open(path, 'rb') as snapshot_file:
+        snapshot = pickle.load(snapshot_file)
+    if snapshot.get('format') != FORMAT_VERSION:
+        raise Exception('{} is not a search checkpoint of this version'.format(path))
+    return snapshot
@@ -1,15 +1,61 @@
+import heapq
 import re
+from bisect import bisect_right
+from array import array
+from collections import OrderedDict
 from graph import Graph
+import world_cache
+
+INFINITY = float('inf')
 
 class World(Graph):
-    def __init__(self, graph_file, k=1):
+    def __init__(self, graph_file, k=1, path_table=False, tree_cache_size=64, cache_dir=None):
         super(World, self).__init__()
         self._k = k
         self._d = 0
         self._graph_path = graph_file
         self.shelter_vertices = []              # Shelter vertex tags
-        self.parse_file()                       # parsing given ASCII file
+        self.load(cache_dir)                    # parsing given ASCII file, or building it from its parsed record
         self.house_vertices = list(set(range(1, self._num_of_vertices + 1)) - set(self.shelter_vertices))
+        self.use_path_table = path_table        # keep a shortest path table of the world
+        self._path_table = None
+        self.pickups = 0                        # bumped every time people are picked up from a house
+        self.tree_cache_size = tree_cache_size  # shortest path trees kept (the least recently used are dropped)
+        self._trees = OrderedDict()             # SOURCE_TAG : ShortestPathTree, least recently used first
+        self.add_listener(self.update_trees)
+        self._shelter_field = None              # VERTEX_TAG : base distance to the closest shelter
+        self.add_listener(self.drop_shelter_field)
+
+    # build the world from the cached record of its file (world_cache.py), or parse the file and cache its record.
+    # records are kept in memory, and in files of cache_dir if given
+    def load(self, cache_dir=None):
+        key = world_cache.file_key(self._graph_path)
+        record = world_cache.lookup(key, cache_dir)
+        if record is None:
+            self.parse_file()
+            world_cache.store(key, self.to_record(), cache_dir)
+        else:
+            self.from_record(record)
+
+    # the parsed file as ints: n, d, the number of shelters, the shelter tags, the people of every vertex
+    # (-1 for a shelter), then a, b, w of every edge. no floats
+    def to_record(self):
+        ints = [self._num_of_vertices, self._d, len(self.shelter_vertices)] + self.shelter_vertices
+        ints.extend(-1 if isinstance(vertex, Shelter) else vertex.people for vertex in self._vertices)
+        for edge in self._edges:
+            ints.extend((edge.v1.tag, edge.v2.tag, edge.weight))
+        return array('i', ints), array('d')
+
+    def from_record(self, record):
+        ints = record[0]
+        self._num_of_vertices, self._d, num_shelters = ints[0], ints[1], ints[2]
+        self.shelter_vertices = list(ints[3:3 + num_shelters])
+        first_edge = 3 + num_shelters + self._num_of_vertices
+        for tag, people in enumerate(ints[3 + num_shelters:first_edge], 1):
+            self._vertices.append(Shelter(tag=tag) if people < 0 else House(tag=tag, people=people))
+            self.adj_dict[tag] = []
+        for i in range(first_edge, len(ints), 3):
+            self.add_edge(Graph.Edge(self._vertices[ints[i] - 1], self._vertices[ints[i + 1] - 1], ints[i + 2]))
 
     def parse_file(self):
         with open(self._graph_path) as graph_file:
@@ -34,9 +80,7 @@ class World(Graph):
             e_lines = filter(lambda l: l.startswith('#E'), lines)
             for line in e_lines:
                 edge = self.parse_edge_line(line=line)
-                self._edges.append(edge)
-                self.adj_dict[edge.v1.tag].append(edge.v2.tag)  # add adjacency
-                self.adj_dict[edge.v2.tag].append(edge.v1.tag)  # to both vertices of the edge
+                self.add_edge(edge)
 
     # parse D line
     def parse_deadline(self, line):
@@ -51,16 +95,16 @@ class World(Graph):
         split_line = new_line.split(' ')
 
         # if its a SHELTER line
-        if len(split_line) is 2 and 's' in new_line.lower():
+        if len(split_line) == 2 and 's' in new_line.lower():
             return Shelter(tag=int(split_line[0]))
         # HOUSE line
-        elif len(split_line) is 3 and 'p' in new_line.lower():
+        elif len(split_line) == 3 and 'p' in new_line.lower():
             return House(tag=int(split_line[0]), people=int(split_line[2]))
 
     # parse an Edge line -: #E 2 4 W5
     def parse_edge_line(self, line):
         new_line = self.remove_comments(line)
-        if len(new_line.split(' ')) is not 4:
+        if len(new_line.split(' ')) != 4:
             raise BaseException('bad line: {}'.format(new_line))
         parsed_line = re.sub('W', '', new_line)
         parsed_line = re.sub('#E ', '', parsed_line)
@@ -84,7 +128,10 @@ class World(Graph):
     def pick_people_up(self, vertex_number):
         vertex = self._vertices[vertex_number - 1]
         if isinstance(vertex, House):
-            return vertex.flee()
+            fled = vertex.flee()
+            if fled > 0:
+                self.pickups += 1
+            return fled
         return 0
 
     # return the slow-down factor
@@ -99,6 +146,60 @@ class World(Graph):
 
     def is_house(self, vertex_num):
         return isinstance(self._vertices[vertex_num - 1], House)
+    # the shortest path table (by base weights) of the roads that are not blocked, or None if not used.
+    # built on the first call, and updated when an edge is blocked or unblocked
+    def get_path_table(self):
+        if not self.use_path_table:
+            return None
+        if self._path_table is None:
+            self._path_table = PathTable(self)
+        return self._path_table
+
+    # the shortest path tree (by base weights) of source. kept up to date when edges are blocked or unblocked
+    def shortest_path_tree(self, source):
+        tree = self._trees.pop(source, None)
+        if tree is None:
+            tree = ShortestPathTree(self, source)
+        self._trees[source] = tree
+        if len(self._trees) > self.tree_cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    # base distance (no people in the car) from v to its closest shelter, INFINITY if no shelter can be reached.
+    # with p people in the car every edge weighs (1 + k*p) times more, so at a fixed load the distance is this one
+    # scaled by (1 + k*p). computed for all vertices at once, by a dijkstra from all the shelters
+    def shelter_distance(self, v):
+        if self._shelter_field is None:
+            self._shelter_field = self.multi_source_dijkstra(self.shelter_vertices)
+        return self._shelter_field.get(v, INFINITY)
+
+    # blocking (or unblocking) an edge changes the distances to the shelters
+    def drop_shelter_field(self, edge):
+        self._shelter_field = None
+
+    # distances by base weights from the closest of sources: { VERTEX_TAG : distance } of the reachable vertices
+    def multi_source_dijkstra(self, sources):
+        distances = dict((source, 0) for source in sources)
+        queue = [(0, source) for source in sources]
+        heapq.heapify(queue)
+        settled = set()
+        while queue:
+            distance_u, u = heapq.heappop(queue)
+            if u in settled:
+                continue
+            settled.add(u)
+            for v, edge_u_v in self.get_adjacent_edges(u):
+                distance_v = distance_u + edge_u_v.weight
+                if v not in distances or distance_v < distances[v]:
+                    distances[v] = distance_v
+                    heapq.heappush(queue, (distance_v, v))
+        return distances
+
+    # repair the kept shortest path trees after edge was blocked or unblocked
+    def update_trees(self, edge):
+        for tree in self._trees.values():
+            tree.edge_changed(edge)
+
     # Task 1 only
     def filter_empty_houses(self):
         new = list(filter(lambda tag: self._vertices[tag - 1].people != 0, self.house_vertices))
@@ -154,33 +255,28 @@ class World(Graph):
     # Dijsktra algorithm, return visited & path :=
     # visited   { VERTEX_TAG : distance of VERTEX_TAG from source }
     # path      { VERTEX_TAG : optimal path from source to VERTEX_TAG
-    def dijkstra(self, source):
+    # if targets are given, stop once all of them are settled (or the first one, if stop_at_first).
+    # only the distances of settled vertices are final then - the rest are upper bounds
+    def dijkstra(self, source, targets=None, stop_at_first=False):
         visited = {source: 0}   # VERTEX_TAG : DISTANCE FROM SOURCE
         path = {}               # V : PREV V Previous node in optimal path from source
+        targets_left = set(targets) if targets is not None else None
 
-        # get all vertices' tags
-        nodes = set((lambda v: v.tag)(v) for v in self._vertices)
-        while nodes:
-            u = None
-            for node in nodes:
-                if node in visited:
-                    if u is None:
-                        u = node
-                    elif visited[node] < visited[u]:
-                        u = node
-
-            if u is None:
-                break
-
+        # priority queue of (distance, VERTEX_TAG). outdated entries are skipped when popped
+        queue = [(0, source)]
+        settled = set()
+        while queue:
             # Node with the least distance will be selected first
-            nodes.remove(u)
-            # get the distance from source to u
-            distance_u = visited[u]
+            distance_u, u = heapq.heappop(queue)
+            if u in settled:
+                continue
+            settled.add(u)
+            if self.all_targets_settled(u, targets_left, stop_at_first):
+                break
 
             # for each neighbor v of u
-            for v in self.get_adjacent_to(u):
+            for v, edge_u_v in self.get_adjacent_edges(u):
                 # get length(u, v)
-                edge_u_v = self.get_edge(u, v)
                 len_u_v = edge_u_v.weight
 
                 # weight = dist[u] + length(u, v)
@@ -190,11 +286,12 @@ class World(Graph):
                 if v not in visited or weight < visited[v]:
                     visited[v] = weight
                     path[v] = u    # prev[v] <- u
+                    heapq.heappush(queue, (weight, v))
         return visited, path
 
 
     # For task 2
-    def super_dijkstra(self, source, people_collected=0, dont_collect=None):
+    def super_dijkstra(self, source, people_collected=0, dont_collect=None, targets=None, stop_at_first=False):
         def add_people(tag, dont_collect):
             if dont_collect is None or tag not in dont_collect:
                 return self.get_vertex_for_tag(tag).people
@@ -206,27 +303,23 @@ class World(Graph):
             people_in_source = people_collected
         visited = {source: (0, people_in_source)}   # VERTEX_TAG : DISTANCE FROM SOURCE
         path = {}               # V : PREV V Previous node in optimal path from source
-        # get all vertices' tags
-        nodes = set((lambda v: v.tag)(v) for v in self._vertices)
-        while nodes:
-            u = None
-            for node in nodes:
-                if node in visited:
-                    if u is None:
-                        u = node
-                    elif visited[node][0] < visited[u][0]:
-                        u = node
-
-            if u is None:
-                break
+        targets_left = set(targets) if targets is not None else None
+
+        # priority queue of (distance, VERTEX_TAG). outdated entries are skipped when popped
+        queue = [(0, source)]
+        settled = set()
+        while queue:
             # Node with the least distance will be selected first
-            nodes.remove(u)
-            # get the distance from source to u
-            distance_u = visited[u][0]
+            distance_u, u = heapq.heappop(queue)
+            if u in settled:
+                continue
+            settled.add(u)
+            if self.all_targets_settled(u, targets_left, stop_at_first):
+                break
             # for each neighbor v of u
-            for v in self.get_adjacent_to(u):
+            for v, edge_u_v in self.get_adjacent_edges(u):
                 # get length(u, v)
-                len_u_v = self.calc_edge_weight(v1=u, v2=v, visited=visited)
+                len_u_v = self.calc_edge_weight(edge=edge_u_v, v1=u, visited=visited)
                 # weight = dist[u] + length(u, v)
                 weight = distance_u + len_u_v
                 #  A shorter path to v has been found
@@ -237,12 +330,20 @@ class World(Graph):
 
                     visited[v] = (weight, people)    # update collected ppl
                     path[v] = u    # prev[v] <- u
+                    heapq.heappush(queue, (weight, v))
 
                    # print('******\n******\nvisited: {}\npath:{}\n******\n******\n'.format(visited, path))
         return visited, path
 
-    def calc_edge_weight(self, v1, v2, visited):
-        edge = self.get_edge(v1, v2)
+    # mark u as settled - return True if the search can stop
+    @staticmethod
+    def all_targets_settled(u, targets_left, stop_at_first):
+        if targets_left is None or u not in targets_left:
+            return False
+        targets_left.remove(u)
+        return stop_at_first or len(targets_left) == 0
+
+    def calc_edge_weight(self, edge, v1, visited):
         v1_collected_people = visited[v1][1]    # num of collected people in v1
         return edge.weight * (1 + self._k * v1_collected_people)
 
@@ -251,6 +352,281 @@ class World(Graph):
 
 
 
+# shortest path tree of a source by the base edge weights, repaired when edges are blocked or unblocked.
+# a block only makes the distances of the subtree below the blocked edge longer, so only that subtree is searched
+# again, from its unaffected neighbours. an unblock only makes distances shorter, from the ends of the edge
+class ShortestPathTree(object):
+    def __init__(self, world, source):
+        self.world = world
+        self.source = source
+        self.distance, self.parent = world.dijkstra(source)   # VERTEX_TAG : distance, VERTEX_TAG : parent tag
+        self.children = {}          # VERTEX_TAG : set of the vertices whose parent it is
+        for v, u in self.parent.items():
+            self.children.setdefault(u, set()).add(v)
+
+    # repair the tree after edge was blocked or unblocked. return True if it changed
+    def edge_changed(self, edge):
+        if edge.blocked:
+            return self.edge_blocked(edge)
+        return self.edge_unblocked(edge)
+
+    def edge_blocked(self, edge):
+        a, b = edge.v1.tag, edge.v2.tag
+        if self.parent.get(b) == a:
+            root = b
+        elif self.parent.get(a) == b:
+            root = a
+        else:
+            return False    # not a tree edge - no distance changes
+        # cut the subtree of root out of the tree
+        self.children[self.parent.pop(root)].discard(root)
+        subtree = set()
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            subtree.add(v)
+            del self.distance[v]
+            self.parent.pop(v, None)
+            stack.extend(self.children.pop(v, ()))
+        # the best way into every subtree vertex from the rest of the tree
+        best, queue = {}, []
+        for v in subtree:
+            for u, edge_u_v in self.world.get_adjacent_edges(v):
+                if u in self.distance and self.distance[u] + edge_u_v.weight < best.get(v, (INFINITY,))[0]:
+                    best[v] = (self.distance[u] + edge_u_v.weight, u)
+            if v in best:
+                heapq.heappush(queue, (best[v][0], v))
+        self.settle(queue, best, subtree)
+        return True
+
+    def edge_unblocked(self, edge):
+        best, queue = {}, []
+        for u, v in ((edge.v1.tag, edge.v2.tag), (edge.v2.tag, edge.v1.tag)):
+            if u in self.distance and self.distance[u] + edge.weight < self.distance.get(v, INFINITY):
+                best[v] = (self.distance[u] + edge.weight, u)
+                heapq.heappush(queue, (best[v][0], v))
+        if len(queue) == 0:
+            return False
+        self.settle(queue, best, None)
+        return True
+
+    # dijkstra from the queued vertices, taking over every vertex it reaches with a shorter distance.
+    # best is VERTEX_TAG : (distance, parent) of the queued vertices. if region is given, only its vertices are
+    # searched (the rest of the tree is known to be final)
+    def settle(self, queue, best, region):
+        while queue:
+            distance_v, v = heapq.heappop(queue)
+            if distance_v > best[v][0] or distance_v >= self.distance.get(v, INFINITY):
+                continue
+            # re-link v under its new parent
+            old_parent = self.parent.get(v)
+            if old_parent is not None:
+                self.children[old_parent].discard(v)
+            self.distance[v] = distance_v
+            self.parent[v] = best[v][1]
+            self.children.setdefault(best[v][1], set()).add(v)
+            for u, edge_v_u in self.world.get_adjacent_edges(v):
+                if region is not None and u not in region:
+                    continue
+                distance_u = distance_v + edge_v_u.weight
+                if distance_u < self.distance.get(u, INFINITY) and distance_u < best.get(u, (INFINITY,))[0]:
+                    best[u] = (distance_u, v)
+                    heapq.heappush(queue, (distance_u, u))
+
+
+# shortest paths of a world by the base edge weights - a row of n-long arrays for every source that was asked for.
+# a row is computed by a single Dijkstra run on the first query from its source, and at most max_cells // n rows are
+# kept (the least recently used are dropped), so on small maps it is an all-pairs table and on big ones memory stays
+# bounded. every row is a shortest path tree, repaired like ShortestPathTree when an edge is blocked or unblocked -
+# only the rows (and in them the vertices) the edge changes are searched again
+class PathTable(object):
+    def __init__(self, world, max_cells=1 << 22):
+        n = world.get_num_vertices()
+        self.n = n
+        self.world = world
+        self.version = world.version                  # the world version the table is up to date with
+        self.max_rows = max(1, max_cells // n)
+        # SOURCE_TAG : (distance, next hop, parent) arrays, indexed by vertex tag - 1, least recently used first.
+        # the next hop is the first vertex on the path from the source, the parent the vertex before the target
+        # (0 if none)
+        self._rows = OrderedDict()
+        world.add_listener(self.edge_changed)
+
+    # the row of source - computed if it isn't kept, and marked as recently used
+    def row(self, source):
+        row = self._rows.get(source)
+        if row is None:
+            row = self.make_row(self.world, source)
+            self._rows[source] = row
+            if len(self._rows) > self.max_rows:
+                self._rows.popitem(last=False)
+        elif self.max_rows < self.n:
+            del self._rows[source]
+            self._rows[source] = row
+        return row
+
+    # the row of source from a single Dijkstra run
+    def make_row(self, world, source):
+        distance = array('d', [INFINITY]) * self.n
+        next_hop = array('i', [0]) * self.n
+        parent = array('i', [0]) * self.n
+        visited, path = world.dijkstra(source)
+        first_hop = {}      # VERTEX_TAG : the vertex after source on the path to VERTEX_TAG
+        for v, distance_v in visited.items():
+            distance[v - 1] = distance_v
+            if v == source:
+                continue
+            parent[v - 1] = path[v]
+            # walk up the path to a vertex whose first hop is known
+            chain = []
+            u = v
+            while u not in first_hop:
+                if path[u] == source:
+                    first_hop[u] = u
+                    break
+                chain.append(u)
+                u = path[u]
+            for w in chain:
+                first_hop[w] = first_hop[u]
+            next_hop[v - 1] = first_hop[v]
+        return distance, next_hop, parent
+
+    # repair the kept rows edge changes paths for
+    def edge_changed(self, edge):
+        a, b = edge.v1.tag, edge.v2.tag
+        for source, row in self._rows.items():
+            parent = row[2]
+            if edge.blocked:
+                if parent[b - 1] == a:
+                    self.repair_blocked(source, row, b)
+                elif parent[a - 1] == b:
+                    self.repair_blocked(source, row, a)
+            else:
+                self.repair_unblocked(source, row, edge)
+        self.version = self.world.version
+
+    # the tree edge into root was blocked - search again the vertices whose path went through root
+    def repair_blocked(self, source, row, root):
+        distance, next_hop, parent = row
+        below = {root: True, source: False}     # VERTEX_TAG : whether its path goes through root
+        subtree = set()
+        for v in range(1, self.n + 1):
+            if distance[v - 1] == INFINITY:
+                continue
+            chain = []
+            u = v
+            while u not in below:
+                chain.append(u)
+                u = parent[u - 1]
+            for w in chain:
+                below[w] = below[u]
+            if below[v]:
+                subtree.add(v)
+        for v in subtree:
+            distance[v - 1] = INFINITY
+            parent[v - 1] = 0
+            next_hop[v - 1] = 0
+        # the best way into every subtree vertex from the rest of the tree
+        best, queue = {}, []
+        for v in subtree:
+            for u, edge_u_v in self.world.get_adjacent_edges(v):
+                distance_v = distance[u - 1] + edge_u_v.weight
+                if distance_v < best.get(v, (INFINITY,))[0]:
+                    best[v] = (distance_v, u)
+            if v in best:
+                heapq.heappush(queue, (best[v][0], v))
+        self.settle(source, row, queue, best, subtree)
+
+    # edge was unblocked - return True if it makes any path from source shorter
+    def repair_unblocked(self, source, row, edge):
+        distance = row[0]
+        best, queue = {}, []
+        for u, v in ((edge.v1.tag, edge.v2.tag), (edge.v2.tag, edge.v1.tag)):
+            distance_v = distance[u - 1] + edge.weight
+            if distance_v < distance[v - 1]:
+                best[v] = (distance_v, u)
+                heapq.heappush(queue, (distance_v, v))
+        if len(queue) == 0:
+            return False
+        self.settle(source, row, queue, best, None)
+        return True
+
+    # dijkstra from the queued vertices in the row of source (see ShortestPathTree.settle)
+    def settle(self, source, row, queue, best, region):
+        distance, next_hop, parent = row
+        while queue:
+            distance_v, v = heapq.heappop(queue)
+            if distance_v > best[v][0] or distance_v >= distance[v - 1]:
+                continue
+            parent_v = best[v][1]
+            distance[v - 1] = distance_v
+            parent[v - 1] = parent_v
+            # the parent is settled before v, so its first hop is already final
+            next_hop[v - 1] = v if parent_v == source else next_hop[parent_v - 1]
+            for u, edge_v_u in self.world.get_adjacent_edges(v):
+                if region is not None and u not in region:
+                    continue
+                distance_u = distance_v + edge_v_u.weight
+                if distance_u < distance[u - 1] and distance_u < best.get(u, (INFINITY,))[0]:
+                    best[u] = (distance_u, v)
+                    heapq.heappush(queue, (distance_u, u))
+
+    # shortest distance from u to v, INFINITY if there is no unblocked path
+    def distance(self, u, v):
+        return self.row(u)[0][v - 1]
+
+    # the vertex to traverse to from u on a shortest path to v, None if there is no path
+    def next_hop(self, u, v):
+        hop = self.row(u)[1][v - 1]
+        return hop if hop != 0 else None
+
+    # the vertices of a shortest path from u to v (without u), by the parents of the row of u alone. None if there is
+    # no path
+    def path(self, u, v):
+        distance, next_hop, parent = self.row(u)
+        if u == v or distance[v - 1] == INFINITY:
+            return None
+        route = [v]
+        while parent[route[-1] - 1] != u:
+            route.append(parent[route[-1] - 1])
+        route.reverse()
+        return route
+
+# the time intervals edges are blocked in, by edge id. answers whether an edge is open over a whole time interval
+# in O(log blocks of the edge). an interval [start, end) is blocked for start <= t < end - a block for good ends at
+# INFINITY. overlapping blocks of an edge are merged
+class BlockageIndex(object):
+    def __init__(self):
+        self._starts = {}       # EDGE_ID : sorted start times of the blocked intervals of the edge
+        self._ends = {}         # EDGE_ID : end times of those intervals
+
+    def add_block(self, edge_id, start, end=INFINITY):
+        intervals = sorted(list(zip(self._starts.get(edge_id, []), self._ends.get(edge_id, []))) + [(start, end)])
+        merged = [intervals[0]]
+        for interval_start, interval_end in intervals[1:]:
+            if interval_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval_end))
+            else:
+                merged.append((interval_start, interval_end))
+        self._starts[edge_id] = [interval_start for interval_start, interval_end in merged]
+        self._ends[edge_id] = [interval_end for interval_start, interval_end in merged]
+
+    # True if the edge is not blocked at any time in [t0, t1]
+    def is_usable(self, edge_id, t0, t1):
+        starts = self._starts.get(edge_id)
+        if starts is None:
+            return True
+        # the last interval that starts by t1 must have ended by t0 (the ones before it end earlier)
+        i = bisect_right(starts, t1) - 1
+        return i < 0 or self._ends[edge_id][i] <= t0
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __str__(self):
+        return str(dict((edge_id, list(zip(self._starts[edge_id], self._ends[edge_id]))) for edge_id in self._starts))
+
+
 # A Shelter vertex.
 class Shelter(Graph.Vertex):
     def __init__(self, tag):
@@ -7,6 +7,10 @@ class Graph(object):
         self._vertices = []
         self._edges = []
         self.adj_dict = {}                      # VERTEX_TAG : VERTEX ADJ'S {"1": [2, 3], "2": [1, 3, 4]}
+        self._edge_index = {}                   # (VERTEX_TAG, VERTEX_TAG) sorted pair : EDGE
+        self._incident = {}                     # VERTEX_TAG : [(ADJ VERTEX_TAG, EDGE)] sorted by the adjacent tag
+        self.version = 0                        # bumped every time an edge is blocked or unblocked
+        self._listeners = []                    # called with the edge, every time an edge is blocked or unblocked
         self._num_of_vertices = 0
         if root is not None:
             self.add_vertex(root)
@@ -19,9 +23,36 @@ class Graph(object):
 
     # should be an Edge object
     def add_edge(self, edge):
+        edge.id = len(self._edges)                      # index of the edge in the graph
         self._edges.append(edge)
         self.adj_dict[edge.v1.tag].append(edge.v2.tag)  # add adjacency
         self.adj_dict[edge.v2.tag].append(edge.v1.tag)  # to both vertices of the edge
+        edge.graph = self
+        # index the edge. lookups return the first edge added between two vertices
+        self._edge_index.setdefault(Graph.pair_key(edge.v1.tag, edge.v2.tag), edge)
+        self.add_incident(edge.v1.tag, edge.v2.tag, edge)
+        self.add_incident(edge.v2.tag, edge.v1.tag, edge)
+
+    # called by an edge of this graph when it gets blocked or unblocked
+    def edge_changed(self, edge):
+        self.version += 1
+        for listener in self._listeners:
+            listener(edge)
+
+    # listener(edge) is called after an edge of the graph is blocked or unblocked
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    # insert (adjacent, edge) to the incident list of vertex, keeping it sorted by the adjacent tag
+    def add_incident(self, vertex, adjacent, edge):
+        incident = self._incident.setdefault(vertex, [])
+        i = len(incident)
+        while i > 0 and incident[i - 1][0] > adjacent:
+            i -= 1
+        incident.insert(i, (adjacent, edge))
 
     # print the adjacency dict
     def print_adjacency(self):
@@ -39,29 +70,56 @@ class Graph(object):
 
     # return the edge of (v1, v2) if exists. else, return False
     def get_edge(self, v1, v2):
-        for edge in self._edges:
-            if edge.is_equal(v1, v2):
-                if not edge.blocked:
-                    return edge
-                return False
+        edge = self._edge_index.get(Graph.pair_key(v1, v2))
+        if edge is None:
+            return None
+        if not edge.blocked:
+            return edge
+        return False
+
+    # return the edge of (v1, v2) even if it is blocked, None if there is no such edge
+    def find_edge(self, v1, v2):
+        return self._edge_index.get(Graph.pair_key(v1, v2))
 
     # returns all adjacent vertices that are NOT blocked
     def get_adjacent_to(self, vertex):
         if isinstance(vertex, Graph.Vertex):
             vertex = vertex.tag
-        adjacent = self.adj_dict[vertex]
-        adjacent = filter(lambda v: self.get_edge(v, vertex) is not False, adjacent)  # filter out all blocked
-        adjacent.sort()
-        return adjacent
+        return [v for v, edge in self._incident.get(vertex, ()) if not edge.blocked]
+
+    # returns (adjacent vertex, edge) for all edges of vertex that are NOT blocked, sorted by the adjacent vertex
+    def get_adjacent_edges(self, vertex):
+        if isinstance(vertex, Graph.Vertex):
+            vertex = vertex.tag
+        return [(v, edge) for v, edge in self._incident.get(vertex, ()) if not edge.blocked]
+
+    # key of an undirected edge between two vertex tags
+    @staticmethod
+    def pair_key(v1, v2):
+        return (v1, v2) if v1 <= v2 else (v2, v1)
 
 
     # describes an edge on the graph
-    class Edge:
+    class Edge(object):
         def __init__(self, v1, v2, w):
             self.v1 = v1
             self.v2 = v2
             self.weight = w
-            self.blocked = False
+            self.graph = None           # the graph the edge was added to
+            self.id = None              # index of the edge in that graph
+            self._blocked = False
+
+        @property
+        def blocked(self):
+            return self._blocked
+
+        # blocking (or unblocking) the edge tells the graph, so it can drop what it computed on the old roads
+        @blocked.setter
+        def blocked(self, blocked):
+            changed = blocked != self._blocked
+            self._blocked = blocked
+            if changed and self.graph is not None:
+                self.graph.edge_changed(self)
 
         # if edge v1-v2 equals (by tag) to this edge
         def is_equal(self, v1, v2):
@@ -72,6 +130,8 @@ class Graph(object):
     # describes a vertex on the graph
     class Vertex:
         __metaclass__ = ABCMeta
+        __slots__ = ('tag',)
+
         def __init__(self, tag=0):
             self.tag = tag
 
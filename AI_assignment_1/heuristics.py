@@ -0,0 +1,138 @@
+from env import INFINITY
+
+
+# the heuristics of the search tree. each gives a lower bound of the people that can't be saved anymore, from the
+# houses left to evacuate in a node - a house is lost if even the fastest way to take its people to a shelter ends
+# after the deadline. a heuristic is admissible if its time bounds never exceed the real evacuation times, so it
+# never counts a house as lost when it can still be saved. the search tree adds the people in the car on top.
+# the time bounds of the house costs are kept in the h table of the tree (tree.calculated_h).
+# a heuristic gives died(tree, node, world). admissible is True only for the heuristics whose bounds are proven -
+# ARA* claims a suboptimality bound only with one of them
+class Heuristic(object):
+    name = None
+    admissible = None
+
+    # the people of the houses in houses_costs [(time bound, people)] that can't make it by the deadline
+    @staticmethod
+    def count_died(node, world, houses_costs):
+        died = 0
+        for cost, people in houses_costs:
+            if node.get_time() + cost > world.get_deadline():
+                died += people
+        return died
+
+
+# a super dijkstra from the node to every house, then the distance from each house to its closest shelter
+# (World.shelter_distance) at the load the agent would have there. O(dijkstra) per new position / visited vertices.
+# not proven admissible: the super dijkstra settles every vertex once by its arrival time, but the edge costs grow
+# with the people collected on the way, so a slower path with fewer people may reach a house earlier later on
+class DijkstraHeuristic(Heuristic):
+    name = 'dijkstra'
+    admissible = False
+
+    def died(self, tree, node, world):
+        # the expensive part of h depends on the position, the people in the car and the visited vertices
+        # (the remaining houses are the populated ones that were not visited), not on the node itself
+        key = (node.get_position(), node.get_people_in_car(), node.visited)
+        houses_costs = tree.calculated_h.get(key)
+        if houses_costs is None:
+            houses_costs = tree.calc_houses_costs(node, world)
+            tree.calculated_h.put(key, houses_costs)
+        return self.count_died(node, world, houses_costs)
+
+
+# the distance to the house (at no load - the agent may drop its people on the way), then the distance from the house
+# to its closest shelter (World.shelter_distance) at the load of the house people.
+# O(houses) per new position / houses left, and a single-source dijkstra per position the world has no paths from.
+# admissible: an edge costs at least its base weight at any load, and at least (1 + k * people) of it once the people
+# of the house are in the car, until they are dropped at a shelter. blocked roads only make the paths longer
+class ShelterHeuristic(Heuristic):
+    name = 'shelter'
+    admissible = True
+
+    # distance by base weights from source to v, INFINITY if there is no unblocked path. read from the world's path
+    # table if it keeps one (--path_table), else from the shortest path tree of source, which the world keeps (the
+    # least recently used are dropped) and repairs when roads are blocked
+    @staticmethod
+    def distance(world, source, v):
+        table = world.get_path_table()
+        if table is not None:
+            return table.distance(source, v)
+        return world.shortest_path_tree(source).distance.get(v, INFINITY)
+
+    def houses_costs(self, node, world):
+        k = world.get_slow_down()
+        houses_costs = []
+        for house in node.get_full_houses():
+            people = world.get_vertex_for_tag(house).people
+            cost = self.distance(world, node.get_position(), house) + world.shelter_distance(house) * (1 + k * people)
+            houses_costs.append((cost, people))
+        return houses_costs
+
+    # houses_costs of the node, from the h table of the tree
+    def cached_houses_costs(self, tree, node, world):
+        key = (node.get_position(), node.houses)
+        houses_costs = tree.calculated_h.get(key)
+        if houses_costs is None:
+            houses_costs = self.houses_costs(node, world)
+            tree.calculated_h.put(key, houses_costs)
+        return houses_costs
+
+    def died(self, tree, node, world):
+        return self.count_died(node, world, self.cached_houses_costs(tree, node, world))
+
+
+# the shelter bound of every house, plus a bound on saving all the houses it leaves: the agent has to pass through
+# all of them, which takes at least the weight of the minimum spanning tree over the position and those houses
+# (by the table distances), and then get to a shelter. if that is after the deadline, at least one more house is
+# lost - at least the people of the smallest one. O(houses^2) per new position / houses left.
+# the tree needs the distances between all the houses, so the world has to keep a path table (--path_table).
+# admissible: a walk from the position through all the houses spans them, so it weighs at least the tree, and it
+# still has to go from its last house to a shelter
+class MSTHeuristic(ShelterHeuristic):
+    name = 'mst'
+    admissible = True
+
+    # weight of the minimum spanning tree over vertices (Prim), by the table distances
+    @staticmethod
+    def spanning_tree_weight(table, vertices):
+        if len(vertices) < 2:
+            return 0
+        weight = 0
+        best = dict((v, table.distance(vertices[0], v)) for v in vertices[1:])     # VERTEX : distance to the tree
+        while best:
+            v = min(best, key=best.get)
+            weight += best.pop(v)
+            for u in best:
+                best[u] = min(best[u], table.distance(v, u))
+        return weight
+
+    def died(self, tree, node, world):
+        table = world.get_path_table()
+        if table is None:
+            raise Exception('the mst heuristic reads the distances between houses from the path table of the world - '
+                            'run with --path_table')
+        houses_costs = self.cached_houses_costs(tree, node, world)
+        died = self.count_died(node, world, houses_costs)
+        # the houses that can still be saved one by one
+        left = [(house, people) for house, (cost, people) in zip(node.get_full_houses(), houses_costs)
+                if node.get_time() + cost <= world.get_deadline()]
+        if len(left) < 2:
+            return died
+        key = ('tour', node.get_position(), tuple(house for house, people in left))
+        tour = tree.calculated_h.get(key)
+        if tour is None:
+            houses = [house for house, people in left]
+            tour = self.spanning_tree_weight(table, [node.get_position()] + houses)
+            tour += min(world.shelter_distance(house) for house in houses)
+            tree.calculated_h.put(key, tour)
+        if node.get_time() + tour > world.get_deadline():
+            died += min(people for house, people in left)
+        return died
+
+
+HEURISTICS = {'dijkstra': DijkstraHeuristic, 'shelter': ShelterHeuristic, 'mst': MSTHeuristic}
+
+
+def make_heuristic(name):
+    return HEURISTICS[name.lower()]()
@@ -0,0 +1,72 @@
+import json
+import time
+
+
+# counters of a search, and the trace of its hot path (the h evaluations and the expansions).
+# tracing is off by default, and then the hot path only pays for a counter and a check of self.tracing.
+# verbose prints the trace lines, trace_file writes them as JSONL events
+class SearchStats(object):
+    def __init__(self, verbose=False, trace_file=None):
+        self.generated = 0          # nodes made by expansions
+        self.expanded = 0
+        self.h_calls = 0
+        self.h_time = 0.0           # seconds in h
+        self.successor_time = 0.0   # seconds in the successor function
+        self.fringe_time = 0.0      # seconds pushing to / popping from fringes
+        self.peak_fringe = 0
+        self.start_time = time.time()
+        self.verbose = verbose
+        self.trace = open(trace_file, 'w') if trace_file is not None else None
+        self.tracing = verbose or self.trace is not None
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def expands_per_second(self):
+        elapsed = self.elapsed()
+        return self.expanded / elapsed if elapsed > 0 else 0
+
+    # go on counting from the counters of as_dict (of a checkpoint)
+    def restore(self, counters):
+        for name in ('generated', 'expanded', 'h_calls', 'h_time', 'successor_time', 'fringe_time', 'peak_fringe'):
+            setattr(self, name, counters[name])
+        self.start_time = time.time() - counters['elapsed']
+
+    def fringe_size(self, size):
+        if size > self.peak_fringe:
+            self.peak_fringe = size
+
+    # ------- trace events. call only if self.tracing
+    def trace_h(self, node, h):
+        if self.verbose:
+            print('\nh: {} is : {}\n\n'.format(node.get_state(alter=True), h))
+        if self.trace is not None:
+            self.write({'event': 'h', 'state': node.state, 'h': h})
+
+    def trace_expand(self, node, children):
+        if self.verbose:
+            print('expanded: {}\n       to {}'.format(node.get_state(alter=True),
+                                                      [child.get_state(alter=True) for child in children]))
+        if self.trace is not None:
+            self.write({'event': 'expand', 'state': node.state, 'children': [child.state for child in children]})
+
+    def write(self, event):
+        event['t'] = self.elapsed()
+        self.trace.write(json.dumps(event) + '\n')
+
+    def close(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+            self.tracing = self.verbose
+
+    # the counters, with the hits and misses of the h table
+    def as_dict(self, h_table=None):
+        stats = {'generated': self.generated, 'expanded': self.expanded, 'h_calls': self.h_calls,
+                 'h_time': self.h_time, 'successor_time': self.successor_time, 'fringe_time': self.fringe_time,
+                 'peak_fringe': self.peak_fringe, 'elapsed': self.elapsed(),
+                 'expands_per_second': self.expands_per_second()}
+        if h_table is not None:
+            stats['h_hits'] = h_table.hits
+            stats['h_misses'] = h_table.misses
+        return stats
@@ -0,0 +1,206 @@
+import argparse
+import heapq
+import math
+import random
+
+
+# randint and sample of python 2 and 3 draw differently from the same seed - these draw only by rand.random(), so a
+# seed gives the same map under both
+def random_int(rand, low, high):
+    return low + int(rand.random() * (high - low + 1))
+
+
+# k distinct elements of population (a partial Fisher-Yates shuffle)
+def random_sample(rand, population, k):
+    pool = list(population)
+    for i in range(k):
+        j = i + int(rand.random() * (len(pool) - i))
+        pool[i], pool[j] = pool[j], pool[i]
+    return pool[:k]
+
+
+# grid of rows x cols vertices (the last row may be partial), each connected to its right and lower neighbours
+def grid_edges(n, rand, max_weight=10):
+    cols = int(math.ceil(math.sqrt(n)))
+    edges = {}
+    for v in range(1, n + 1):
+        if v % cols != 0 and v + 1 <= n:
+            edges[(v, v + 1)] = random_int(rand, 1, max_weight)
+        if v + cols <= n:
+            edges[(v, v + cols)] = random_int(rand, 1, max_weight)
+    return edges
+
+
+# random points in the unit square. weight of an edge - the distance between its ends (at least 1)
+def random_points(n, rand):
+    return [(rand.random(), rand.random()) for _ in range(n)]
+
+
+def distance(points, a, b):
+    (xa, ya), (xb, yb) = points[a - 1], points[b - 1]
+    return math.hypot(xa - xb, ya - yb)
+
+
+def distance_weight(points, a, b, scale):
+    return max(1, int(math.floor(distance(points, a, b) * scale + 0.5)))     # halves up, as round of python 2
+
+
+# the points in a grid of square cells, for the points near a point
+class CellIndex(object):
+    def __init__(self, points, cell_size):
+        self.points = points
+        self.cell_size = cell_size
+        self.cells = {}         # (CELL_X, CELL_Y) : [VERTEX_TAG]
+        for v, point in enumerate(points, 1):
+            self.cells.setdefault(self.cell_of(point), []).append(v)
+
+    def cell_of(self, point):
+        return int(point[0] / self.cell_size), int(point[1] / self.cell_size)
+
+    # the vertices in the cells of the square ring at distance r (in cells) around the cell of v
+    def ring(self, v, r):
+        cx, cy = self.cell_of(self.points[v - 1])
+        if r == 0:
+            ring = [(cx, cy)]
+        else:
+            ring = [(cx + d, cy - r) for d in range(-r, r + 1)] + [(cx + d, cy + r) for d in range(-r, r + 1)]
+            ring += [(cx - r, cy + d) for d in range(-r + 1, r)] + [(cx + r, cy + d) for d in range(-r + 1, r)]
+        for cell in ring:
+            for u in self.cells.get(cell, ()):
+                yield u
+
+    # the closest count vertices to v for which accept(u) is true, closest first
+    def nearest(self, v, count=1, accept=lambda u: True):
+        found = []
+        max_r = int(math.ceil(1 / self.cell_size)) + 1
+        r = 0
+        while r <= max_r:
+            found.extend(u for u in self.ring(v, r) if u != v and accept(u))
+            # a vertex in a further ring may still be closer than the ones of this ring - look one ring further
+            if len(found) >= count:
+                found.extend(u for u in self.ring(v, r + 1) if u != v and accept(u))
+                break
+            r += 1
+        found.sort(key=lambda u: distance(self.points, u, v))
+        return found[:count]
+
+
+# random geometric graph - points connected if they are closer than the radius that gives the average degree.
+# the weights are distances, scaled so neighbours are a few time units apart
+def geometric_edges(n, rand, degree=4):
+    points = random_points(n, rand)
+    radius = math.sqrt(degree / (math.pi * n))
+    scale = 3 / radius
+    index = CellIndex(points, radius)
+    edges = {}
+    for a in range(1, n + 1):
+        for r in (0, 1):
+            for b in index.ring(a, r):
+                if a < b and distance(points, a, b) <= radius:
+                    edges[(a, b)] = distance_weight(points, a, b, scale)
+    connect_components(n, index, edges, scale)
+    return edges
+
+
+# road-like graph - every point is linked to its nearest neighbours (local streets), and a few long straight
+# roads (highways, cheaper per distance) join far apart points
+def road_edges(n, rand, neighbours=2, highways=None):
+    points = random_points(n, rand)
+    cell_size = math.sqrt(4.0 / n)      # about 4 points a cell
+    scale = 3 / cell_size
+    index = CellIndex(points, cell_size)
+    edges = {}
+    for a in range(1, n + 1):
+        for b in index.nearest(a, count=neighbours):
+            edges[(min(a, b), max(a, b))] = distance_weight(points, a, b, scale)
+    highways = highways if highways is not None else max(1, int(math.sqrt(n) / 2))
+    for _ in range(highways):
+        a, b = random_sample(rand, range(1, n + 1), 2)
+        edges[(min(a, b), max(a, b))] = max(1, distance_weight(points, a, b, scale) // 2)
+    connect_components(n, index, edges, scale)
+    return edges
+
+
+# join every component of the graph to the largest one, by an edge from a vertex of the component to the closest
+# vertex of the largest component
+def connect_components(n, index, edges, scale):
+    parent = list(range(n + 1))
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+    for a, b in edges:
+        parent[find(a)] = find(b)
+    sizes = {}
+    for v in range(1, n + 1):
+        sizes[find(v)] = sizes.get(find(v), 0) + 1
+    largest = max(sizes, key=lambda root: sizes[root])
+    joined = set([largest])
+    for v in range(1, n + 1):
+        root = find(v)
+        if root in joined:
+            continue
+        joined.add(root)
+        for u in index.nearest(v, accept=lambda u: find(u) == largest):
+            edges[(min(u, v), max(u, v))] = distance_weight(index.points, u, v, scale)
+
+
+# length of the longest shortest path from vertex 1
+def eccentricity(n, edges):
+    adjacent = {}
+    for (a, b), w in edges.items():
+        adjacent.setdefault(a, []).append((b, w))
+        adjacent.setdefault(b, []).append((a, w))
+    distances = {1: 0}
+    heap = [(0, 1)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > distances[u]:
+            continue
+        for v, w in adjacent.get(u, ()):
+            if v not in distances or d + w < distances[v]:
+                distances[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return max(distances.values())
+
+
+GENERATORS = {'grid': grid_edges, 'geometric': geometric_edges, 'road': road_edges}
+
+
+# generate a map and write it to path in the #V / #E / #D format. the agents start at vertex 1, so it is never a
+# house. return the deadline of the map (by default, twice the longest shortest path from vertex 1)
+def generate(path, kind='grid', n=25, house_density=0.3, people=5, shelters=1, deadline=None, seed=0):
+    rand = random.Random(seed)
+    edges = GENERATORS[kind](n, rand)
+    if deadline is None:
+        deadline = 2 * eccentricity(n, edges)
+    shelter_tags = random_sample(rand, range(1, n + 1), min(shelters, n))
+    with open(path, 'w') as graph_file:
+        graph_file.write('#V {}\n'.format(n))
+        for (a, b), w in sorted(edges.items()):
+            graph_file.write('#E {} {} W{}\n'.format(a, b, w))
+        for v in range(1, n + 1):
+            if v in shelter_tags:
+                graph_file.write('#V {} S\n'.format(v))
+            elif v != 1 and rand.random() < house_density:
+                graph_file.write('#V {} P {}\n'.format(v, random_int(rand, 1, people)))
+        graph_file.write('#D {}\n'.format(deadline))
+    return deadline
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-o', '--output', default='./generated.txt')
+    parser.add_argument('-m', '--kind', choices=sorted(GENERATORS), default='grid')
+    parser.add_argument('-n', '--vertices', type=int, default=25)
+    parser.add_argument('--house_density', type=float, default=0.3)     # chance of a vertex to be a house
+    parser.add_argument('--people', type=int, default=5)                # max people in a house
+    parser.add_argument('--shelters', type=int, default=1)
+    parser.add_argument('-d', '--deadline', type=int, default=None)     # twice the longest shortest path from 1
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    generate(path=args.output, kind=args.kind, n=args.vertices, house_density=args.house_density, people=args.people,
+             shelters=args.shelters, deadline=args.deadline, seed=args.seed)
@@ -1,77 +1,402 @@
-from env import Shelter, House
+import heapq
+import time
+from collections import OrderedDict
+from itertools import count
+
+from checkpoint import Checkpointer, read_snapshot
 from graph import Graph
+from heuristics import make_heuristic
+from instrumentation import SearchStats
 
 
 
 class SearchTree(Graph):
-    def __init__(self, init_state, strategy='greedy', expand_limit=None, vandal_records=None):
+    def __init__(self, init_state, strategy='greedy', expand_limit=None, vandal_records=None, graph_search=False,
+                 h_cache_size=100000, retain_tree=True, heuristic='dijkstra', verbose=False, trace_file=None,
+                 checkpoint_file=None, checkpoint_interval=None):
         self.expand_limit = expand_limit
         self.strategy = strategy
-        self.root = SmartVertex(None, init_state)  # initial node
-        super(SearchTree, self).__init__(self.root)
-        self.calculated_h = {}
+        self.graph_search = graph_search        # drop nodes whose state was already expanded
+        # keep every generated node as a vertex of the search graph. if False, a node is only referenced by its
+        # children (parent links) and the fringe, so the nodes that can't be on the solution path are freed
+        self.retain_tree = retain_tree
+        root = SmartVertex.from_state(init_state)   # initial node
+        super(SearchTree, self).__init__(root if retain_tree else None)
+        self.root = root
+        self.heuristic = make_heuristic(heuristic)     # the bound of the people that can't be saved (heuristics.py)
+        self.calculated_h = TranspositionTable(max_size=h_cache_size)   # h table, shared by nodes of the same state
+        self.learned_h = {}     # STATE_KEY : h learned by real time search, when leaving that state
         self.num_expands = 0
+        self.stats = SearchStats(verbose=verbose, trace_file=trace_file)     # counters and trace of the search
         self.vandal_records = vandal_records
+        self.weight = 1.0       # weight of h in the f of ARA*
+        # snapshots of tree_search to checkpoint_file (checkpoint.py), every checkpoint_interval seconds or on a signal
+        self.checkpointer = Checkpointer(checkpoint_file, checkpoint_interval) if checkpoint_file is not None else None
+        self.resumed = None     # (fringe, closed) loaded from a checkpoint, for tree_search to go on from
 
+    # return the goal node, 'FAILURE', or 'INTERRUPTED' if a signal stopped the search after a checkpoint
     def tree_search(self, world):
-        # initialize the search tree using the init_state of root
-        # fringe - queue sorted in decreasing order of desirability
-        fringe = [self.root]
+        if self.resumed is not None:
+            fringe, closed = self.resumed
+            self.resumed = None
+        else:
+            # initialize the search tree using the init_state of root
+            # fringe - queue sorted in decreasing order of desirability
+            fringe = Fringe(self.stats)
+            fringe.push(self.root, self.priority(self.root, world))
+            closed = {}     # STATE_KEY : g of the state when it was expanded (graph search only)
         while True:
+            if self.checkpointer is not None and self.checkpointer.due():
+                self.checkpointer.save(self.snapshot(world, fringe, closed))
+                if self.checkpointer.stop:
+                    return 'INTERRUPTED'
             # if there are no candidates for expansion -> FAIL
-            if len(fringe) is 0:
+            if len(fringe) == 0:
                 return 'FAILURE'
             # choose a leaf node for expansion according to strategy
-            node = self.get_best(fringe, world)
-            fringe.remove(node)
+            node = fringe.pop()
             # if the node contains a goal state -> SOLUTION
             if self.goal_test(node, world):
                 return node
             # else expand the node and add the resulting nodes to the search tree
             if self.strategy.upper() == 'RTA' and self.num_expands >= self.expand_limit:
                     return node
-            fringe += self.expand(node, world)
+            if self.graph_search:
+                if self.is_duplicate(node, closed):
+                    continue
+                closed[node.get_key()] = self.g(node)
+            for child in self.expand(node, world):
+                if self.graph_search and self.is_duplicate(child, closed):
+                    continue
+                fringe.push(child, self.priority(child, world))
+
+    # ------- checkpoints of tree_search
+    # the search as a dict of plain values - the fringe, the closed states, the h table, the learned h and the
+    # counters. the nodes are flat tuples (parent index, action, position, houses, people in car, time), every
+    # node after its parent, and only the fringe nodes and their ancestors (the rest can't be on the solution path)
+    def snapshot(self, world, fringe, closed):
+        index = {}      # NODE : index in nodes
+        nodes = []
+        self.flatten(self.root, index, nodes)
+        entries = []
+        for priority, order, node in fringe.dump():
+            self.flatten(node, index, nodes)
+            entries.append((priority, order, index[node]))
+        return {'search': self.checkpoint_key(world),
+                'nodes': nodes,
+                'fringe': entries,
+                'closed': closed,
+                'h_table': self.calculated_h.dump(),
+                'learned_h': self.learned_h,
+                'num_expands': self.num_expands,
+                'stats': self.stats.as_dict()}
+
+    # add node and its ancestors that are not in index yet to nodes
+    @staticmethod
+    def flatten(node, index, nodes):
+        path = []
+        while node is not None and node not in index:
+            path.append(node)
+            node = node.parent
+        for node in reversed(path):
+            parent = index[node.parent] if node.parent is not None else -1
+            index[node] = len(nodes)
+            nodes.append((parent, node.action, node.position, node.houses, node.people_in_car, node.time))
+
+    # a checkpoint is resumed only by the same kind of search on the same world
+    def checkpoint_key(self, world):
+        return (self.strategy.upper(), self.heuristic.name, self.graph_search,
+                world.get_num_vertices(), world.get_slow_down(), world.get_deadline())
+
+    # load the checkpoint at path - the next tree_search goes on from it
+    def resume(self, path, world):
+        snapshot = read_snapshot(path)
+        if snapshot['search'] != self.checkpoint_key(world):
+            raise Exception('{} is a checkpoint of another search or world'.format(path))
+        nodes = []
+        for parent, action, position, houses, people_in_car, node_time in snapshot['nodes']:
+            parent = nodes[parent] if parent >= 0 else None
+            nodes.append(SmartVertex(parent, position, houses, people_in_car, node_time, action=action))
+        self.root = nodes[0]
+        super(SearchTree, self).__init__(self.root if self.retain_tree else None)
+        if self.retain_tree:
+            for node in nodes[1:]:
+                node.parent.add_child(node)
+                self.add_vertex(node)
+        fringe = Fringe(self.stats)
+        fringe.load([(priority, order, nodes[i]) for priority, order, i in snapshot['fringe']])
+        self.resumed = (fringe, snapshot['closed'])
+        self.calculated_h.load(snapshot['h_table'])
+        self.learned_h = snapshot['learned_h']
+        self.num_expands = snapshot['num_expands']
+        self.stats.restore(snapshot['stats'])
+
+    # IDA* - depth first searches bounded by f = g + h. each iteration raises the bound to the smallest f that
+    # exceeded it. the nodes are not kept in the search graph, so memory is linear in the depth of the search
+    def ida_search(self, world):
+        threshold = self.priority(self.root, world)
+        self.ida_iterations = []    # [(f threshold, expansions)] per iteration
+        while True:
+            expands_before = self.num_expands
+            result, next_threshold = self.bounded_dfs(world, threshold)
+            self.ida_iterations.append((threshold, self.num_expands - expands_before))
+            print('IDA* iteration {}: f threshold {}, expanded {}'.format(len(self.ida_iterations), threshold,
+                                                                         self.num_expands - expands_before))
+            if result is not None:
+                return result
+            # nothing exceeded the bound - the whole space was searched
+            if next_threshold == float('inf'):
+                return 'FAILURE'
+            threshold = next_threshold
+
+    # ARA* - anytime weighted A*. the first search is by f = g + weight * h with a high weight, so a solution is found
+    # fast. then the weight is lowered step by step, and each search goes on from the fringe of the one before (states
+    # reached again with a better g are reopened). the weighted searches put aside the nodes of states reached again
+    # with a worse g - dropping them is not safe here, h is not consistent and the deadline makes a later time at a
+    # state not always worse - so their solutions have no proven bound. the weight 1 search goes on from all of them
+    # (see prove_path), until time_budget seconds passed. return the best solution found
+    def anytime_search(self, world, time_budget=None, initial_weight=3.0, weight_step=0.5):
+        end_time = time.time() + time_budget if time_budget is not None else None
+        self.weight = initial_weight
+        self.solutions = []     # [(weight, cost, suboptimality bound or None)] of the solutions found, in order
+        best_g = {self.root.get_key(): self.g(self.root)}   # STATE_KEY : best g the state was reached with
+        expanded = set()        # (STATE_KEY, g) of the nodes expanded
+        suspended = []          # nodes of states reached with a worse g than best_g
+        fringe = Fringe(self.stats)
+        fringe.push(self.root, self.priority(self.root, world))
+        incumbent = None
+        while self.weight > 1:
+            inconsistent = []   # nodes of states reached with a better g after the state was expanded
+            incumbent, finished = self.improve_path(world, fringe, inconsistent, suspended, best_g, expanded,
+                                                    incumbent, end_time)
+            if incumbent is None:
+                return 'FAILURE'
+            if not finished:
+                return incumbent
+            self.add_solution(self.solution_cost(incumbent, world), None)
+            if end_time is not None and time.time() >= end_time:
+                return incumbent
+            # lower the weight and re-prioritize the fringe and the reopened nodes
+            self.weight = max(1.0, self.weight - weight_step)
+            open_nodes = [node for priority, node in fringe.entries()]
+            fringe = Fringe(self.stats)
+            for node in open_nodes + inconsistent:
+                if self.g(node) <= best_g[node.get_key()]:
+                    fringe.push(node, self.priority(node, world))
+                else:
+                    suspended.append(node)
+        return self.prove_path(world, fringe, suspended, expanded, incumbent, end_time)
+
+    # one ARA* search with the current weight - expand the fringe while it may hold a better solution than incumbent.
+    # the nodes of states reached with a worse g are added to suspended. return (best solution, whether the search
+    # finished before end_time)
+    def improve_path(self, world, fringe, inconsistent, suspended, best_g, expanded, incumbent, end_time):
+        closed = set()      # STATE_KEY of the states expanded in this search
+        while len(fringe) > 0:
+            # a first solution is always searched for, the time budget only limits the improvements
+            if incumbent is not None and end_time is not None and time.time() >= end_time:
+                return incumbent, False
+            priority, node = fringe.top()
+            if incumbent is not None and priority >= self.solution_cost(incumbent, world):
+                break
+            fringe.pop()
+            key = node.get_key()
+            # reached again with a better g since it was pushed
+            if self.g(node) > best_g[key]:
+                suspended.append(node)
+                continue
+            if self.goal_test(node, world):
+                if incumbent is None or self.solution_cost(node, world) < self.solution_cost(incumbent, world):
+                    incumbent = node
+                continue
+            closed.add(key)
+            expanded.add((key, self.g(node)))
+            for child in self.expand(node, world):
+                child_key = child.get_key()
+                child_g = self.g(child)
+                # the same state at the same time is the same search node
+                if child_g == best_g.get(child_key):
+                    continue
+                if child_g > best_g.get(child_key, float('inf')):
+                    suspended.append(child)
+                    continue
+                best_g[child_key] = child_g
+                if child_key in closed:
+                    inconsistent.append(child)
+                else:
+                    fringe.push(child, self.priority(child, world))
+        return incumbent, True
+
+    # the weight 1 search of ARA* - A* on from the fringe of the weighted searches and the nodes they put aside
+    # (nodes), over the nodes whose f is below the cost of incumbent (the others can't lead to a better solution).
+    # only a node of a state and time that was already expanded is dropped - it has the same successors - so when the
+    # fringe has no f below the cost of the best solution, that solution is optimal (as the one of A*). if end_time
+    # comes first, the smallest f of the fringe bounds the cost of any better solution. return the best solution found
+    def prove_path(self, world, fringe, nodes, expanded, incumbent, end_time):
+        for node in nodes:
+            fringe.push(node, self.priority(node, world))
+        while len(fringe) > 0:
+            priority, node = fringe.top()
+            if incumbent is not None and priority >= self.solution_cost(incumbent, world):
+                break
+            if incumbent is not None and end_time is not None and time.time() >= end_time:
+                cost = self.solution_cost(incumbent, world)
+                self.add_solution(cost, float(cost) / priority if priority > 0 else None)
+                return incumbent
+            fringe.pop()
+            if self.goal_test(node, world):
+                if incumbent is None or self.solution_cost(node, world) < self.solution_cost(incumbent, world):
+                    incumbent = node
+                continue
+            key = (node.get_key(), self.g(node))
+            if key in expanded:
+                continue
+            expanded.add(key)
+            for child in self.expand(node, world):
+                priority = self.priority(child, world)
+                if (incumbent is None or priority < self.solution_cost(incumbent, world)) and \
+                        (child.get_key(), self.g(child)) not in expanded:
+                    fringe.push(child, priority)
+        if incumbent is None:
+            return 'FAILURE'
+        self.add_solution(self.solution_cost(incumbent, world), 1.0)
+        return incumbent
+
+    # a bound holds only if h is admissible (heuristics.py)
+    def add_solution(self, cost, bound):
+        if not self.heuristic.admissible:
+            bound = None
+        self.solutions.append((self.weight, cost, bound))
+        print('ARA* solution {}: weight {}, cost {}, suboptimality bound {}'.format(
+            len(self.solutions), self.weight, cost, 'not proven' if bound is None else repr(bound)))
+
+    # the cost of a solution - its (unweighted) f
+    def solution_cost(self, node, world):
+        return self.g(node) + self.h(node, world)
+
+    # depth first search of the nodes with f <= threshold. return (goal node or None, smallest f above threshold)
+    def bounded_dfs(self, world, threshold):
+        next_threshold = float('inf')
+        stack = [iter([self.root])]     # the successors left to visit, for each node on the current path
+        while len(stack) > 0:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            f = self.priority(node, world)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+            if self.goal_test(node, world):
+                return node, next_threshold
+            stack.append(iter(self.expand(node, world, retain=False)))
+        return None, next_threshold
+
+    # real time search - a bounded A* lookahead of at most expand_limit expansions below node.
+    # return [(f, child)] for the children of node, sorted by the f backed up to the child - the best f found on the
+    # frontier below the child, but never less than the f of the child itself (pathmax: h is not consistent, so f
+    # can go down along a path, while the f of the child is already a bound for its whole subtree).
+    # ties go to the child with the lower h - the one that made more progress. the lookahead nodes are only linked to
+    # node by their parents, so the memory of a decision is dropped once it is made
+    def lookahead(self, node, world):
+        fringe = Fringe(self.stats)
+        branch = {}         # NODE : the child of node it descends from
+        best_f = {}         # CHILD : best f found on the frontier below the child
+        child_f = {}        # CHILD : f of the child
+        children = self.expand(node, world, retain=False)
+        for child in children:
+            branch[child] = child
+            child_f[child] = self.priority(child, world)
+            fringe.push(child, child_f[child])
+        expands = 1
+        while len(fringe) > 0 and expands < self.expand_limit:
+            f, lookahead_node = fringe.pop_entry()
+            # goal nodes are not expanded - their f is final
+            if self.goal_test(lookahead_node, world):
+                self.update_best_f(best_f, branch[lookahead_node], f)
+                continue
+            for child in self.expand(lookahead_node, world, retain=False):
+                branch[child] = branch[lookahead_node]
+                fringe.push(child, self.priority(child, world))
+            expands += 1
+        # the rest of the frontier
+        for f, frontier_node in fringe.entries():
+            self.update_best_f(best_f, branch[frontier_node], f)
+        ranked = [(max(child_f[child], best_f[child]), child_f[child] - self.g(child), i, child)
+                  for i, child in enumerate(children) if child in best_f]
+        ranked.sort()
+        return [(f, child) for f, h, i, child in ranked]
+
+    @staticmethod
+    def update_best_f(best_f, child, f):
+        if child not in best_f or f < best_f[child]:
+            best_f[child] = f
+
+    # real time search - remember h for the state of node, now that the agent leaves it
+    def learn(self, node, h):
+        self.learned_h[node.get_key()] = h
+
+    # graph search (tree_search) - a node is a duplicate if its state was already expanded.
+    # A* reopens the state only if the node reached it with a better g
+    def is_duplicate(self, node, closed):
+        key = node.get_key()
+        if key not in closed:
+            return False
+        if self.strategy == 'greedy':
+            return True
+        return self.g(node) >= closed[key]
 
-    # get best node according to heuristic evaluation function and strategy
-    def get_best(self, fringe, world):
+    # priority of a node according to heuristic evaluation function and strategy (lower is better)
+    def priority(self, node, world):
         if self.strategy == 'greedy':
             # Using Greedy Search - by h(n)
-            m = min(fringe, key=lambda node: self.h(node, world))
+            return self.h(node, world)
         # Using A* Search - by f(n) = h(n) + g(n)
         elif self.strategy.upper() == 'A*':
-            m = min(fringe, key=lambda node: self.h(node, world) + self.g(node))
-        else:   # if self.strategy.upper() is 'RTA':
-            m = min(fringe, key=lambda node: self.h(node, world) + self.g(node))
-        return m
+            return self.h(node, world) + self.g(node)
+        # Using ARA* - by f(n) = weight * h(n) + g(n). the f of a goal node is final, so its h is not inflated
+        elif self.strategy.upper() == 'ARA*':
+            if self.goal_test(node, world):
+                return self.h(node, world) + self.g(node)
+            return self.weight * self.h(node, world) + self.g(node)
+        else:   # if self.strategy.upper() is 'RTA' or 'IDA*':
+            return self.h(node, world) + self.g(node)
 
     # isolate the houses out of all vertices of shape : (vertex, [cost, people])
     def isolate_sort_houses(self, vertices, world, visited=None,remove_empty_houses = False):
         def house_filter(house):
             return world.get_vertex_for_tag(house[0]).people > 0 and house[0] not in visited
-        isolated = list([key, value] for key, value in vertices.iteritems() if world.is_house(key))
+        isolated = list([key, value] for key, value in vertices.items() if world.is_house(key))
         isolated.sort(key=lambda x: x[1][0])
         if remove_empty_houses and visited is not None:
-            isolated = filter(house_filter, isolated)
+            isolated = [house for house in isolated if house_filter(house)]
 
         return isolated
 
-    # isolate the houses out of all vertices of shape : (vertex, [cost, people])
-    def isolate_sort_shelters(self, vertices, world):
-        isolated = list([key, value] for key, value in vertices.iteritems() if world.is_shelter(key))
-        isolated.sort(key=lambda x: x[1][0])
-        return isolated
-
     def g(self, node):
             return node.get_time()
 
     def h(self, node, world):
-        if node in self.calculated_h:
-            return self.calculated_h[node]
-        # print('Calculating H({})'.format(node.state))
-        died = 0
+        start = time.time()
         FACTOR = 1#world.get_deadline() * 2
+        died = self.heuristic.died(self, node, world)
+        h = (max(died, node.get_people_in_car()))*FACTOR
+        # the time is not in the key, but it only grows - so an h learned earlier still holds
+        learned = self.learned_h.get(node.get_key())
+        if learned is not None and learned > h:
+            h = learned
+        self.stats.h_calls += 1
+        self.stats.h_time += time.time() - start
+        if self.stats.tracing:
+            self.stats.trace_h(node, h)
+        return h
+
+    # for each house left - (time to the house and from there to the closest shelter, people in the house)
+    def calc_houses_costs(self, node, world):
+        # print('Calculating H({})'.format(node.state))
+        houses_costs = []
         # get all visited vertices till this state
-        visited_h = self.get_visited_vertices(node)
+        visited_h = node.get_visited()
         people_collected = node.get_people_in_car()
         vertices_h, path_h = world.super_dijkstra(source=node.get_position(), people_collected=people_collected, dont_collect=visited_h)
         # print('\n----------------\nSuper dijkstra from vertex: {} to nearest house\ngot vertices {} \npath {}--------------------\n\n'.format(node.get_position() -1,
@@ -80,24 +405,17 @@ class SearchTree(Graph):
         vertices_h.pop(node.get_position(), None)   # remove self
         houses = self.isolate_sort_houses(vertices=vertices_h, world=world, visited=visited_h, remove_empty_houses=True)       #TODO Check for bug (no houses)
         current_tag = node.get_position()
-        if world.is_house(current_tag) and current_tag ==  self.get_visited_vertices(node)[0] and world.get_vertex_for_tag(current_tag).people > 0 :
-            house_entry  = [current_tag , (0,world.get_vertex_for_tag(current_tag).people )]
-            houses += [house_entry]
-            visited_h += [house_entry]
+        if world.is_house(current_tag) and world.get_vertex_for_tag(current_tag).people > 0:
+            houses += [[current_tag, (0, world.get_vertex_for_tag(current_tag).people)]]
         for house in houses:
-            # print('houses --- {}'.format(houses))
-            visited = visited_h + [house[0]]# + self.get_vertices_in_path(path_h, house[0])                # update the visited vertices (DONT PICK UP FROM THEM)
             cost_to_house = house[1][0]
             people_collected = house[1][1]  # collected people on the way to the house
-            vertices_s, path_s = world.super_dijkstra(source=house[0], people_collected=people_collected, dont_collect=visited)
-            shelters = self.isolate_sort_shelters(vertices=vertices_s, world=world)
-            closest_shelter = shelters[0]
-            cost_to_shelter = closest_shelter[1][0]
-            if node.get_time() + cost_to_house + cost_to_shelter > world.get_deadline():
-                died += world.get_vertex_for_tag(house[0]).people
-        self.calculated_h[node] = (max(died, node.get_people_in_car()))*FACTOR
-        print('\nh: {} is : {}\n\n'.format(node.get_state(alter=True), self.calculated_h[node]))
-        return self.calculated_h[node]
+            # the load only grows on the way to the closest shelter, so the shortest distance to a shelter
+            # at the load of the house is a lower bound of the cost
+            load = people_collected if people_collected != 0 else world.get_vertex_for_tag(house[0]).people
+            cost_to_shelter = world.shelter_distance(house[0]) * (1 + world.get_slow_down() * load)
+            houses_costs.append((cost_to_house + cost_to_shelter, world.get_vertex_for_tag(house[0]).people))
+        return houses_costs
 
     # returns list of vertices for given dijkstra path (of predecessors)
     def get_vertices_in_path(self, path, to):
@@ -108,22 +426,6 @@ class SearchTree(Graph):
                 to = path[to]
         except KeyError:
             return vertices
-    # return a list of "visited" vertices for a given node state
-
-    def get_visited_vertices(self, node):
-        visited = []
-        while node is not None:
-            visited.append(node.get_position())
-            node = node.parent
-        return visited
-
-    # given a node in the search tree, and a "final" node, get the next one for "current"
-    def get_next_node_in_path(self, current, last_node):
-        current_node = last_node
-        while last_node.parent != current:
-            current_node = current_node.parent
-        return current_node
-
 
 
 
@@ -131,127 +433,257 @@ class SearchTree(Graph):
 
     # goal_test - goal state - saved all people OR time ends up
     def goal_test(self, node, world):
-        return ((len(node.get_full_houses()) is 0) and (node.get_people_in_car() is 0)) \
-               or (node.get_time() >= world.get_deadline())
+        return (node.houses == 0 and node.people_in_car == 0) or (node.time >= world.get_deadline())
 
     # return set of SmartVertex Nodes to expand s
-    def expand(self, s, world):
-        pairs = self.successor(s.state, world)
+    # if retain is False (or the tree is not retained), the new nodes are only linked to s by their parent
+    # (not kept in the search graph)
+    def expand(self, s, world, retain=True):
+        retain = retain and self.retain_tree
         successors_nodes = []
-        for action, result in pairs:
-            # path_cost [s] = path_cost[s] + step_cost(node, action, s) = result.time (already calc it)
-            # as a result - just assign state of the new node to be the result
-            node = SmartVertex(parent=s, action=action, state=result)
-            # add the new node to s children
-            s.add_child(node)
-            # add the new node as a new vertex at the search graph
-            self.add_vertex(node)
-            # add a new edge (s <-> node)
-            # in the *env* graph - we know that s is adjacent of node so get the edge and add it to the *search* graph
+        start = time.time()
+        pairs = self.successor(s, world)
+        self.stats.successor_time += time.time() - start
+        for action, (position, houses, people_in_car, new_time) in pairs:
+            # path_cost [s] = path_cost[s] + step_cost(node, action, s) = result time (already calc it)
+            node = SmartVertex(s, position, houses, people_in_car, new_time, action=action)
+            if retain:
+                # add the new node to s children
+                s.add_child(node)
+                # add the new node as a new vertex at the search graph
+                self.add_vertex(node)
             # add the new node to successors
             successors_nodes.append(node)
-        print('expanded: {}\n       to {}'.format(s.get_state(alter=True), [node.get_state(alter=True) for node in successors_nodes]))
         self.num_expands += 1
+        self.stats.expanded += 1
+        self.stats.generated += len(successors_nodes)
+        if self.stats.tracing:
+            self.stats.trace_expand(s, successors_nodes)
         return successors_nodes
 
-    # Successor function for a state and observation (the world in our case)
-    def successor(self, state, world):
-        position = state['position']                    # position of the agent in the world
-        neighbours = world.get_adjacent_to(position)    # neighbours
+    # Successor function for a node and observation (the world in our case).
+    # return [(action, (position, houses bitmask, people in car, time))]
+    def successor(self, node, world):
+        position = node.position                        # position of the agent in the world
+        k = world.get_slow_down()
         pairs = []
-        for v in neighbours:
-            new_full_houses = list(state['full_houses'])
-            new_people_in_car = state['people_in_car']
-            new_time = state['time'] + self.calculate_price(world, position, v, state['people_in_car'])
+        for v, edge in world.get_adjacent_edges(position):     # neighbours
+            new_houses = node.houses
+            new_people_in_car = node.people_in_car
+            new_time = node.time + edge.weight * (1 + k * node.people_in_car)
+            # for bonus - the road must not be blocked by the vandal while the agent is on it
+            if self.vandal_records is not None and not self.vandal_records.is_usable(edge.id, node.time, new_time):
+                continue
             # if v is House Vertex -> pick up
-            if world.is_house(v) and v in new_full_houses:
-                new_full_houses.remove(v)
+            if new_houses & vertex_bit(v) and world.is_house(v):
+                new_houses &= ~vertex_bit(v)
                 new_people_in_car += world.get_vertex_for_tag(v).people
             # if v is Shelter Vertex -> drop off all of them
             if world.is_shelter(v) and new_time <= world.get_deadline():
                 new_people_in_car = 0
             # creating [action, result]
             action = 'T{}'.format(str(v))
-            result = {'position': v,
-                      'full_houses': new_full_houses,
-                      'people_in_car': new_people_in_car,
-                      'time': new_time
-                      }
-            # if result['time'] > world.get_deadline():
-            #     continue
-            # for bonus
-            if self.vandal_records is not None:
-
-                try:
-                    block_time = self.vandal_records['{},{}'.format(str(v), str(position))]
-                    if not (state['time'] <= block_time <= result['time']):
-
-                        continue
-                except KeyError:
-                    pairs.append((action, result))
-                    continue
-            pairs.append((action, result))
+            pairs.append((action, (v, new_houses, new_people_in_car, new_time)))
         return pairs
 
-    # time it takes to traverse on 'edge'
-    def calculate_price(self, world, v1, v2, p):
-        edge = world.get_edge(v1, v2)
-        w = edge.weight
-        k = world.get_slow_down()
-        return w*(1+k*p)
+
+# priority queue of search nodes. the priority of a node is given once, when it is pushed.
+# ties are broken by insertion order, so the first node pushed is the first popped.
+# the time of pushes and pops and the peak size are counted in stats, if given
+class Fringe(object):
+    def __init__(self, stats=None):
+        self._heap = []             # (priority, insertion order, node)
+        self._order = count()
+        self._stats = stats
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, node, priority):
+        if self._stats is None:
+            heapq.heappush(self._heap, (priority, next(self._order), node))
+            return
+        start = time.time()
+        heapq.heappush(self._heap, (priority, next(self._order), node))
+        self._stats.fringe_time += time.time() - start
+        self._stats.fringe_size(len(self._heap))
+
+    # remove and return the node with the lowest priority
+    def pop(self):
+        return self.pop_entry()[1]
+
+    # (priority, node) with the lowest priority, without removing it
+    def top(self):
+        priority, order, node = self._heap[0]
+        return priority, node
+
+    # remove and return (priority, node) with the lowest priority
+    def pop_entry(self):
+        if self._stats is None:
+            priority, order, node = heapq.heappop(self._heap)
+            return priority, node
+        start = time.time()
+        priority, order, node = heapq.heappop(self._heap)
+        self._stats.fringe_time += time.time() - start
+        return priority, node
+
+    # (priority, node) of all the nodes in the fringe, in no particular order
+    def entries(self):
+        return [(priority, node) for priority, order, node in self._heap]
+
+    # (priority, insertion order, node) of all the nodes, for a checkpoint
+    def dump(self):
+        return list(self._heap)
+
+    # the entries of a dumped fringe. nodes pushed later are ordered after all of them, as they would have been
+    def load(self, entries):
+        self._heap = list(entries)
+        heapq.heapify(self._heap)
+        self._order = count(max([order for priority, order, node in self._heap] + [-1]) + 1)
+
+
+# bounded LRU table of heuristic values, with hit/miss counters
+class TranspositionTable(object):
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._table = OrderedDict()     # KEY : VALUE, least recently used first
+
+    def __len__(self):
+        return len(self._table)
+
+    # return the value of key (and mark it as recently used), or None if it is not in the table
+    def get(self, key):
+        try:
+            value = self._table.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self._table[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._table.pop(key, None)
+        self._table[key] = value
+        if len(self._table) > self.max_size:
+            self._table.popitem(last=False)   # evict the least recently used
+
+    # (items least recently used first, hits, misses), for a checkpoint
+    def dump(self):
+        return list(self._table.items()), self.hits, self.misses
+
+    def load(self, dump):
+        items, self.hits, self.misses = dump
+        self._table = OrderedDict(items[-self.max_size:])
 
 
 # tag generator
-def tag_gen():
-    i = 1
-    while True:
-        yield i
-        i += 1
+gen = count(1)
+
+
+# bit of a vertex in a bitmask of vertices (the houses left to evacuate, the visited vertices)
+def vertex_bit(tag):
+    return 1 << (tag - 1)
+
+
+# tags of the houses in a bitmask, in increasing order
+def houses_of_mask(mask):
+    houses = []
+    tag = 1
+    while mask:
+        if mask & 1:
+            houses.append(tag)
+        mask >>= 1
+        tag += 1
+    return houses
+
+
+# immutable set of vertex tags over a bitmask - constant time membership
+class VertexSet(object):
+    __slots__ = ('mask',)
 
+    def __init__(self, mask=0):
+        self.mask = mask
 
-gen = tag_gen()
+    def __contains__(self, tag):
+        return (self.mask >> (tag - 1)) & 1 == 1
 
+    def __len__(self):
+        return bin(self.mask).count('1')
 
+    def __iter__(self):
+        return iter(houses_of_mask(self.mask))
+
+    # a new set with tag added
+    def with_vertex(self, tag):
+        return VertexSet(self.mask | vertex_bit(tag))
+
+
+# a node of the search tree. the state is kept in scalar fields, and the houses left to evacuate in a bitmask -
+# the state dict is only built when it is asked for. children are kept only if a child is added.
+# visited is the bitmask of the vertices on the path from the root, derived from the parent
 class SmartVertex(Graph.Vertex):
-        def __init__(self, parent, state, action='NOP'):
+        __slots__ = ('action', 'parent', 'children', 'position', 'houses', 'people_in_car', 'time', 'visited')
+
+        def __init__(self, parent, position, houses, people_in_car, time, action='NOP'):
             self.action = action
-            self.children = []
+            self.children = None
             self.parent = parent
-            self.state = state.copy()
-            super(SmartVertex, self).__init__(gen.next())
+            self.position = position
+            self.houses = houses
+            self.people_in_car = people_in_car
+            self.time = time
+            self.visited = (parent.visited if parent is not None else 0) | vertex_bit(position)
+            super(SmartVertex, self).__init__(next(gen))
+
+        # a node for a state dict
+        @staticmethod
+        def from_state(state, parent=None, action='NOP'):
+            houses = 0
+            for tag in state['full_houses']:
+                houses |= vertex_bit(tag)
+            return SmartVertex(parent, state['position'], houses, state['people_in_car'], state['time'], action=action)
+
+        @property
+        def state(self):
+            # in the order python 2 prints the keys in
+            return {'position': self.position,
+                    'people_in_car': self.people_in_car,
+                    'full_houses': houses_of_mask(self.houses),
+                    'time': self.time
+                    }
 
         def get_state(self, alter=False):
+            state = self.state
             if alter:
-                new_s = dict(self.state)
-                new_s['position'] -= 1
-                houses  = new_s['full_houses']
-                houses = [h - 1 for h in houses]
-                new_s['full_houses'] = houses
-                return new_s
-            return self.state
+                state['position'] -= 1
+                state['full_houses'] = [h - 1 for h in state['full_houses']]
+            return state
 
         def add_child(self, node_to_add):
+            if self.children is None:
+                self.children = []
             self.children.append(node_to_add)
 
         def get_position(self):
-            return self.state['position']
+            return self.position
 
         def get_full_houses(self):
-            return self.state['full_houses']
+            return houses_of_mask(self.houses)
 
         def get_people_in_car(self):
-            return self.state['people_in_car']
+            return self.people_in_car
 
         def get_time(self):
-            return self.state['time']
-
-
-
-
-
-
-
-
-
+            return self.time
 
+        # the vertices on the path from the root to this node
+        def get_visited(self):
+            return VertexSet(self.visited)
 
+        # hashable canonical key of the state. the time is left out - it is the g of the node,
+        # so reaching the same key earlier is a better path to the same state
+        def get_key(self):
+            return (self.position, self.houses, self.people_in_car)
@@ -1,9 +1,15 @@
 import argparse
+import heapq
+import os
+import sys
+import time
 from abc import ABCMeta
+from itertools import count
+from multiprocessing import Pool
 
 from agents.simple_agents import Human, Greedy, Vandal
-from agents.smart_agents import SmartGreedy, SmartAStar, SmartRTA
-from env import World
+from agents.smart_agents import SmartGreedy, SmartAStar, SmartIDAStar, SmartARAStar, SmartRTA
+from env import World, BlockageIndex
 
 
 class Simulator:
@@ -14,17 +20,23 @@ class Simulator:
         self.agents = agents
 
 class HurricaneEvacuationSimulator(Simulator):
-    def __init__(self, graph_file, agent_file, f):
+    def __init__(self, graph_file, agent_file, f, search_options=None, path_table=False, time_budget=None, k=None,
+                 world_cache=None):
         self.graph_file = graph_file
+        self.time_budget = time_budget      # seconds of search for the anytime (ARA*) agent, None for no limit
+        self.path_table = path_table        # the world keeps a shortest path table (PathTable)
+        self.world_cache = world_cache      # directory of the parsed records of graph files, None for memory only
+        self.search_options = search_options if search_options is not None else {}  # passed to the smart agents
         self.time = 0             # track time of the world
         self.evacuated = 0        # total number of people evacuated
         self.f_constant = f
         self.agents_history = []  # search paths of smart agents
-        world = World(graph_file=graph_file, k=self.prompt_k())
+        k = self.prompt_k() if k is None else self.check_k(k)
+        world = World(graph_file=graph_file, k=k, path_table=path_table, cache_dir=world_cache)
         self.deadline = world.get_deadline()
         agents = self.get_agents_data(agent_file=agent_file, world=world)
         super(HurricaneEvacuationSimulator, self).__init__(state=world, agents=agents)
-        self.vandal_records = {}  # pairs of <edge>:<time-of-blocking>
+        self.vandal_records = BlockageIndex()  # the times the vandal blocked edges
     # return num of actions for each agent
     def get_all_actions(self):
         agent_actions = {}
@@ -97,8 +109,9 @@ class HurricaneEvacuationSimulator(Simulator):
     def simulate_vandal(self, agent):
         while self.time <= self.deadline:
             self.do_vandal(agent=agent)
-        # re-create the world
-        self.state = World(graph_file=self.graph_file, k=self.state.get_slow_down())
+        # re-create the world - from the parsed record of its file, which is kept in memory
+        self.state = World(graph_file=self.graph_file, k=self.state.get_slow_down(), path_table=self.path_table,
+                           cache_dir=self.world_cache)
     # input in the format of : H1 V3 G10 H2 ;  <Type|Vertex>
 
     def get_agents_data(self,  world, agent_file=None):
@@ -127,7 +140,11 @@ class HurricaneEvacuationSimulator(Simulator):
     # prompt the user for the K  -   slow down constant
     def prompt_k(self):
         k = 1#float(input('Enter the slow-down constant: '))
-        # 0 < K < 1
+        return self.check_k(k)
+
+    # 0 < K <= 1
+    @staticmethod
+    def check_k(k):
         if 0 < k <= 1:
             return k
         raise Exception('K must be in range (0,1)')
@@ -156,18 +173,106 @@ class HurricaneEvacuationSimulator(Simulator):
                 print('----step done, time {}----\n\n'.format(self.time))
 
 
-    def run_task2(self, expand_limit, agent="greedy"):
-        agent_type = agent
-        print(agent_type)
+    # task 1 as discrete events - every agent acts when its last action is done, by a clock of its own, so the agents
+    # move at the same time. a traversal takes the agent to its destination (where it picks up or drops off) when it ends
+    def run_task1_events(self):
+        print('DEADLINE IS {}'.format(self.deadline))
+        events = []         # (time the agent is ready, order, agent)
+        order = count()
+        arrivals = {}       # AGENT : the destination of the traversal the agent is on
+        # First round of pick-ups
+        for agent in self.agents:
+            if isinstance(agent, Human) or isinstance(agent, Greedy):
+                agent.pick_up()
+            heapq.heappush(events, (0, next(order), agent))
+        while len(events) > 0:
+            ready, _, agent = heapq.heappop(events)
+            # arriving later than the deadline is too late
+            if ready > self.deadline:
+                break
+            self.time = ready
+            if agent in arrivals:
+                self.arrive(agent, arrivals.pop(agent))
+            if self.time >= self.deadline:
+                continue
+            if isinstance(agent, Human):
+                agent.print_agent_status()
+            duration = self.start_action(agent, arrivals)
+            heapq.heappush(events, (self.time + duration, next(order), agent))
+            print('Time : {}\n---------'.format(self.time))
+            agent.print_agent_status()
+            print('----step done, time {}----\n\n'.format(self.time))
+
+    # the agent chooses its next action and starts it. return the time the action takes
+    def start_action(self, agent, arrivals):
+        next_move = agent.do()
+        agent.add_action(next_move)
+        if next_move == 'NOP':
+            return 1
+        if str(next_move).startswith('BLOCK'):
+            v1 = int(next_move.split()[1])
+            v2 = int(next_move.split()[2])
+            self.state.get_edge(v1, v2).blocked = True
+            self.record_block(v1, v2)
+            return 1
+        # Traverse
+        if next_move[0].upper() != 'T':
+            raise Exception('Unknown action')
+        dest = int(next_move[1:])   # number of the destination vertex
+        edge_to_traverse = self.state.get_edge(agent.vertex, dest)
+        arrivals[agent] = dest
+        return self.calculate_price(agent=agent, edge=edge_to_traverse)
+
+    # the agent gets to the destination of its traversal
+    def arrive(self, agent, dest):
+        agent.vertex = dest
+        if agent.observation.is_house(agent.vertex) and not isinstance(agent, Vandal):
+            agent.pick_up()
+        elif agent.get_people_in_car() > 0:   # if in a Shelter vertex
+            agent.drop_off()
+
+    # create a smart agent for the given strategy
+    def create_smart_agent(self, agent_type, expand_limit, vandal_records=None):
         if agent_type.lower() == "greedy":
-            smart_agent = SmartGreedy(world=self.state, name='SmartGreedy', init_vertex=1)
+            return SmartGreedy(world=self.state, name='SmartGreedy', init_vertex=1, bonus_vandal_records=vandal_records,
+                               **self.search_options)
         elif agent_type.lower() == "a*":
-            smart_agent = SmartAStar(world=self.state, name='SmartAStar', init_vertex=1)
+            return SmartAStar(world=self.state, name='SmartAStar', init_vertex=1, bonus_vandal_records=vandal_records,
+                              **self.search_options)
+        elif agent_type.lower() == "ida*":
+            return SmartIDAStar(world=self.state, name='SmartIDAStar', init_vertex=1, bonus_vandal_records=vandal_records,
+                                **self.search_options)
+        elif agent_type.lower() == "ara*":
+            return SmartARAStar(world=self.state, name='SmartARAStar', init_vertex=1, bonus_vandal_records=vandal_records,
+                                time_budget=self.time_budget, **self.search_options)
         else: #if agent.upper() is "RTA":
-            smart_agent = SmartRTA(world=self.state, name='RTA', init_vertex=1, expand_limit=expand_limit)
+            return SmartRTA(world=self.state, name='RTA', init_vertex=1, expand_limit=expand_limit,
+                            bonus_vandal_records=vandal_records, **self.search_options)
+
+    # resume - a checkpoint file of the search to go on from (GREEDY and A* searches only)
+    def run_task2(self, expand_limit, agent="greedy", resume=None):
+        agent_type = agent
+        print(agent_type)
+        smart_agent = self.create_smart_agent(agent_type, expand_limit)
+        tree = smart_agent.search_tree
+        if (resume is not None or tree.checkpointer is not None) and \
+                not isinstance(smart_agent, (SmartGreedy, SmartAStar)):
+            raise Exception('Only GREEDY and A* searches can be checkpointed')
+        if resume is not None:
+            tree.resume(resume, self.state)
+            print('Resumed from {} ({} expanded)'.format(resume, tree.num_expands))
 
         self.agents.append(smart_agent)
+        if tree.checkpointer is not None:
+            tree.checkpointer.install_signal_handlers()
         final_node = smart_agent.do()
+        if tree.checkpointer is not None:
+            tree.checkpointer.remove_signal_handlers()
+        tree.stats.close()
+        if final_node == 'INTERRUPTED':
+            print('Search interrupted after {} expanded, checkpoint saved to {}'.format(tree.num_expands,
+                                                                                     tree.checkpointer.path))
+            return
         self.agents_history.append((agent_type, self.get_state_path(final_node)))
         self.print_run()
 
@@ -178,15 +283,11 @@ class HurricaneEvacuationSimulator(Simulator):
         print('------------\nThe Vandal records are: {}\n------------\n'.format(self.vandal_records))
         agent_type = agent
         print(agent_type)
-        if agent_type.lower() == "greedy":
-            smart_agent = SmartGreedy(world=self.state, name='SmartGreedy', init_vertex=1, bonus_vandal_records=self.vandal_records)
-        elif agent_type.lower() == "a*":
-            smart_agent = SmartAStar(world=self.state, name='SmartAStar', init_vertex=1, bonus_vandal_records=self.vandal_records)
-        else: #if agent.upper() is "RTA":
-            smart_agent = SmartRTA(world=self.state, name='RTA', init_vertex=1, expand_limit=expand_limit, bonus_vandal_records=self.vandal_records)
+        smart_agent = self.create_smart_agent(agent_type, expand_limit, vandal_records=self.vandal_records)
 
         self.agents.append(smart_agent)
         final_node = smart_agent.do()
+        smart_agent.search_tree.stats.close()
         self.agents_history.append((agent_type, self.get_state_path(final_node)))
         self.print_run()
 
@@ -216,6 +317,50 @@ class HurricaneEvacuationSimulator(Simulator):
         #     self.do_vandal(vandal)
         #     # state[]
 
+    # run the strategies (and RTA with every expand limit) in a process pool, each on its own copy of the world.
+    # the workers don't checkpoint, trace or print their searches - they would all write to the same file / output.
+    # if first_to_finish, the rest are cancelled once a strategy is done. print a table ranked by performance
+    def run_portfolio(self, strategies, expand_limits, jobs=None, first_to_finish=False):
+        configs = []
+        for strategy in strategies:
+            limits = expand_limits if strategy.upper() == 'RTA' else [None]
+            for expand_limit in limits:
+                configs.append({'graph_file': self.graph_file,
+                                'strategy': strategy,
+                                'expand_limit': expand_limit,
+                                'f': self.f_constant,
+                                'search_options': dict(self.search_options, retain_tree=False,
+                                                       checkpoint_file=None, trace_file=None, verbose=False),
+                                'path_table': self.path_table,
+                                'world_cache': self.world_cache,
+                                'time_budget': self.time_budget,
+                                'k': self.state.get_slow_down()})
+        pool = Pool(processes=jobs, initializer=silence_output)
+        results = []
+        try:
+            for result in pool.imap_unordered(run_search, configs):
+                results.append(result)
+                if first_to_finish:
+                    break
+        finally:
+            # cancels the searches that are still running
+            pool.terminate()
+            pool.join()
+        self.print_portfolio(results)
+        return results
+
+    def print_portfolio(self, results):
+        results = sorted(results, key=lambda result: result['performance'])
+        print('{:>4} {:>8} {:>6} {:>6} {:>8} {:>12} {:>9}'.format('rank', 'strategy', 'limit', 'score', 'expands',
+                                                                  'performance', 'time (s)'))
+        for rank, result in enumerate(results, 1):
+            limit = result['expand_limit'] if result['expand_limit'] is not None else '-'
+            print('{:>4} {:>8} {:>6} {:>6} {:>8} {:>12} {:>9.3f}'.format(rank, result['strategy'], limit, result['score'],
+                                                                         result['expands'], result['performance'],
+                                                                         result['time']))
+        if len(results) > 0:
+            print('\nAction Trace of {}:\n    {}\n'.format(results[0]['strategy'], results[0]['actions']))
+
     # create a path of states from the final node. the path is the agent's actions.
     def get_state_path(self, final_node):
         path = [final_node]
@@ -234,7 +379,7 @@ class HurricaneEvacuationSimulator(Simulator):
         for i in range(len(state_path))[1:]:
             in_car = state_path[i].get_people_in_car()
             # if 0 people in car, it means last state was a drop-off
-            if in_car is 0:
+            if in_car == 0:
                 score += state_path[i - 1].get_people_in_car()
         return score
 
@@ -252,7 +397,7 @@ class HurricaneEvacuationSimulator(Simulator):
 
     def print_run(self):
 
-        if len(self.agents_history) is 0:
+        if len(self.agents_history) == 0:
             print('Nothing to print!')
             return
         for agent, state_path in self.agents_history:
@@ -262,15 +407,57 @@ class HurricaneEvacuationSimulator(Simulator):
             p = self.f_constant * score + expands
             print('**********\nShowing steps of {}.\nscore:{}\nExpands:{}'.format(agent, score, expands))
             print('Performance: {} = {} * {} + {}'.format(p, self.f_constant, score, expands))
+            h_table = self.agents[-1].search_tree.calculated_h
+            print('H cache: {} hits, {} misses'.format(h_table.hits, h_table.misses))
+            stats = self.agents[-1].search_tree.stats
+            print('Search: {} generated, {} expanded ({:.0f}/s), {} h calls, peak fringe {}'.format(
+                stats.generated, stats.expanded, stats.expands_per_second(), stats.h_calls, stats.peak_fringe))
+            print('Time in h {:.3f}s, successor {:.3f}s, fringe {:.3f}s'.format(stats.h_time, stats.successor_time,
+                                                                               stats.fringe_time))
+            if isinstance(self.agents[-1], SmartARAStar):
+                print('Solutions (weight, cost, bound): {}'.format(self.agents[-1].search_tree.solutions))
             print('Final State: {}\n\n'.format(state_path[len(state_path) - 1].state))
             print('Action Trace:\n    {}\n'.format(actions))
 
 
+    # the edge is blocked for good from now on
     def record_block(self, v1, v2):
-        edge1 = '{},{}'.format(str(v1), str(v2))
-        edge2 = '{},{}'.format(str(v2), str(v1))
-        self.vandal_records[edge1] = self.time
-        self.vandal_records[edge2] = self.time
+        self.vandal_records.add_block(self.state.find_edge(v1, v2).id, self.time)
+
+
+# a worker of a process pool - its searches print a lot, and the output of parallel workers would mix
+def silence_output():
+    sys.stdout = open(os.devnull, 'w')
+
+
+# run the smart agent of a config (graph_file, strategy, expand_limit, f, search_options, path_table, time_budget,
+# and optionally k and world_cache) on a new simulator. return the config's strategy and expand limit with the actions, final state, score, expands,
+# performance and wall time of the run
+def run_search(config):
+    start = time.time()
+    sim = HurricaneEvacuationSimulator(graph_file=config['graph_file'], agent_file=None, f=config['f'],
+                                       search_options=config['search_options'], path_table=config['path_table'],
+                                       time_budget=config['time_budget'], k=config.get('k'),
+                                       world_cache=config.get('world_cache'))
+    smart_agent = sim.create_smart_agent(config['strategy'], config['expand_limit'])
+    final_node = smart_agent.do()
+    smart_agent.search_tree.stats.close()
+    if final_node == 'FAILURE':
+        actions, final_state, score = [], 'FAILURE', 0
+    else:
+        state_path = sim.get_state_path(final_node)
+        actions = [node.action for node in state_path]
+        final_state = final_node.state
+        score = sim.get_score_from_path(state_path)
+    return {'strategy': config['strategy'],
+            'expand_limit': config['expand_limit'],
+            'actions': actions,
+            'final_state': final_state,
+            'score': score,
+            'expands': smart_agent.expands,
+            'performance': config['f'] * score + smart_agent.expands,
+            'time': time.time() - start,
+            'stats': smart_agent.search_tree.stats.as_dict(smart_agent.search_tree.calculated_h)}
 
 
 if __name__ == '__main__':
@@ -278,18 +465,49 @@ if __name__ == '__main__':
     parser.add_argument('-g', '--graph_file', default='./graph.txt')
     parser.add_argument('-a', '--agent_file', default='./agents.txt') # for task 1
     parser.add_argument('-t', '--task_number', default='1')
+    parser.add_argument('--scheduler', choices=['rounds', 'events'], default='rounds')   # for task 1
     parser.add_argument('-s', '--smart_strategy', type=str, default='GREEDY')  # for task 2
     parser.add_argument('-e', '--expand_limit', default='11') # for task 2 - RTA
     parser.add_argument('-f', '--f_parameter', default='-100') # for performance measure
+    parser.add_argument('-k', '--slow_down', type=float, default=None)  # the slow-down constant, 0 < k <= 1
+    parser.add_argument('--graph_search', action='store_true')  # for task 2 - drop repeated states
+    parser.add_argument('--path_table', action='store_true')    # keep a shortest path table of the world
+    parser.add_argument('--world_cache', default=None)          # directory of the parsed records of graph files
+    parser.add_argument('-H', '--heuristic', choices=['dijkstra', 'shelter', 'mst'], default='dijkstra')  # for task 2
+    parser.add_argument('-v', '--verbose', action='store_true')   # for task 2 - print every h and expansion
+    parser.add_argument('--trace', default=None)                    # for task 2 - JSONL file of every h and expansion
+    parser.add_argument('--lightweight', action='store_true')   # for task 2 - keep only the parent links of nodes
+    parser.add_argument('-p', '--portfolio', action='store_true')  # for task 2 - run all the strategies in parallel
+    parser.add_argument('--portfolio_strategies', nargs='+', default=['GREEDY', 'A*', 'RTA'])
+    parser.add_argument('--portfolio_limits', type=int, nargs='+', default=[5, 11, 25, 50])  # expand limits of RTA
+    parser.add_argument('--first_to_finish', action='store_true')  # for the portfolio - stop at the first result
+    parser.add_argument('-j', '--jobs', type=int, default=None)    # for the portfolio - worker processes (all cores)
+    parser.add_argument('-b', '--time_budget', type=float, default=None)    # for task 2 - ARA* seconds of search
+    parser.add_argument('--checkpoint', default=None)   # for task 2 - file to snapshot the search to
+    parser.add_argument('--checkpoint_interval', type=float, default=None)  # seconds between snapshots
+    parser.add_argument('--resume', default=None)      # for task 2 - checkpoint file to go on from
 
 
     args = parser.parse_args()
-
-    sim = HurricaneEvacuationSimulator(graph_file=args.graph_file, agent_file=args.agent_file, f=int(args.f_parameter))
+    if args.heuristic == 'mst' and not args.path_table:
+        parser.error('-H mst reads the distances between houses from the path table - add --path_table')
+
+    search_options = {'graph_search': args.graph_search, 'retain_tree': not args.lightweight,
+                      'heuristic': args.heuristic, 'verbose': args.verbose, 'trace_file': args.trace,
+                      'checkpoint_file': args.checkpoint, 'checkpoint_interval': args.checkpoint_interval}
+    sim = HurricaneEvacuationSimulator(graph_file=args.graph_file, agent_file=args.agent_file, f=int(args.f_parameter),
+                                       search_options=search_options, path_table=args.path_table,
+                                       time_budget=args.time_budget, k=args.slow_down,
+                                       world_cache=args.world_cache)
     sim.state.print_adjacency()
     print('\n\n')
-    if args.task_number == '2':
-        sim.run_task2(agent=args.smart_strategy, expand_limit=int(args.expand_limit))
+    if args.task_number == '2' and args.portfolio:
+        sim.run_portfolio(strategies=args.portfolio_strategies, expand_limits=args.portfolio_limits, jobs=args.jobs,
+                          first_to_finish=args.first_to_finish)
+    elif args.task_number == '2':
+        sim.run_task2(agent=args.smart_strategy, expand_limit=int(args.expand_limit), resume=args.resume)
+    elif args.task_number == '1' and args.scheduler == 'events':
+        sim.run_task1_events()
     elif args.task_number == '1':
         sim.run_task1()
     # run the bonus
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules of the assignment are imported by their file names (as sim.py imports them), from the directory above
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
@@ -0,0 +1,10 @@
+from test_smart_agents import run
+
+
+# the dijkstra heuristic reads the distance of a house to a shelter from the shelter field of the world
+# instead of a super dijkstra from every house. its values changed, the searches on the example map did not
+def test_dijkstra_expansions_on_the_example_map():
+    greedy = run('GREEDY')
+    assert (greedy['expands'], greedy['actions']) == (4, ['NOP', 'T3', 'T4', 'T3', 'T1'])
+    astar = run('A*')
+    assert (astar['expands'], astar['actions']) == (11, ['NOP', 'T3', 'T4', 'T3', 'T1'])
@@ -0,0 +1,18 @@
+from env import World, PathTable
+from mapgen import generate
+
+
+# a path read from the table is the path of the shortest path tree of its source, and takes the row of the source only
+def test_path_is_read_from_the_row_of_the_source(tmp_path):
+    graph_file = str(tmp_path / 'grid.txt')
+    generate(graph_file, kind='grid', n=30, seed=1)
+    world = World(graph_file=graph_file)
+    table = PathTable(world)
+    tree = world.shortest_path_tree(1)
+    for v in range(2, world.get_num_vertices() + 1):
+        route = [v]
+        while tree.parent[route[0]] != 1:
+            route.insert(0, tree.parent[route[0]])
+        assert table.path(1, v) == route
+    assert table.path(1, 1) is None
+    assert list(table._rows) == [1]
@@ -0,0 +1,17 @@
+from agents.simple_agents import Greedy
+from env import World
+from mapgen import generate
+
+
+# a greedy agent that is moved off its path (the next vertex of the path is not a neighbour) finds a new path
+def test_greedy_leaves_its_path(tmp_path):
+    graph_file = str(tmp_path / 'grid.txt')
+    generate(graph_file, kind='grid', n=30, seed=1)
+    world = World(graph_file=graph_file)
+    agent = Greedy(world=world, name='test', init_vertex=1)
+    agent.do()
+    next_vertex = agent._route[0]
+    agent.vertex = next(v for v in range(1, world.get_num_vertices() + 1)
+                        if v != 1 and v not in agent._route and not world.get_edge(v, next_vertex))
+    move = agent.do()
+    assert world.get_edge(agent.vertex, int(move[1:]))
@@ -0,0 +1,59 @@
+import os
+
+from agents.smart_agents import SmartAStar, SmartARAStar, SmartRTA
+from env import World
+from mapgen import generate
+from sim import run_search
+
+GRAPH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'graph.txt')
+
+
+# run a task 2 search on a new simulator (see sim.run_search)
+def run(strategy, graph_file=GRAPH_FILE, expand_limit=None, **search_options):
+    return run_search({'graph_file': graph_file, 'strategy': strategy, 'expand_limit': expand_limit, 'f': -100,
+                       'search_options': search_options, 'path_table': False, 'time_budget': None, 'k': 1})
+
+
+# the RTA agent of the original assignment saved the person of vertex 4 on the example map with the default limit
+def test_rta_saves_as_many_as_the_baseline():
+    result = run('RTA', expand_limit=11)
+    assert result['score'] >= 1
+    assert result['actions'] == ['NOP', 'T3', 'T4', 'T3', 'T1']
+
+
+# the lookahead of a decision is not kept in the search graph - only the root is
+def test_rta_keeps_no_lookahead_nodes():
+    agent = SmartRTA(world=World(graph_file=GRAPH_FILE), expand_limit=11, name='test', init_vertex=1)
+    agent.do()
+    assert agent.search_tree.num_expands > 1
+    assert agent.search_tree.get_num_vertices() == 1
+
+
+# solve graph_file with a new agent of agent_class. return (cost of the solution, search tree)
+def solve(agent_class, graph_file, **search_options):
+    world = World(graph_file=graph_file)
+    agent = agent_class(world=world, name='test', init_vertex=1, **search_options)
+    node = agent.do()
+    return agent.search_tree.solution_cost(node, world), agent.search_tree
+
+
+# the weighted searches of ARA* stop at cost 13 on this map. the weight 1 search has to find the cost of A*, and only
+# that solution has a proven bound. it goes on from the weighted searches, so all of ARA* expands less than A*
+def test_ara_ends_with_the_astar_cost(tmp_path):
+    graph_file = str(tmp_path / 'road.txt')
+    generate(graph_file, kind='road', n=8, seed=7)
+    astar_cost, astar_tree = solve(SmartAStar, graph_file, heuristic='shelter')
+    ara_cost, ara_tree = solve(SmartARAStar, graph_file, heuristic='shelter')
+    assert ara_cost == astar_cost
+    assert ara_tree.solutions[-1] == (1.0, astar_cost, 1.0)
+    assert all(bound is None for weight, cost, bound in ara_tree.solutions[:-1])
+    assert ara_tree.solutions[0][1] > astar_cost
+    assert ara_tree.num_expands < astar_tree.num_expands
+
+
+# the dijkstra heuristic is not proven admissible, so ARA* claims no bound with it
+def test_ara_proves_no_bound_without_an_admissible_heuristic(tmp_path):
+    graph_file = str(tmp_path / 'road.txt')
+    generate(graph_file, kind='road', n=8, seed=7)
+    ara_cost, ara_tree = solve(SmartARAStar, graph_file, heuristic='dijkstra')
+    assert all(bound is None for weight, cost, bound in ara_tree.solutions)
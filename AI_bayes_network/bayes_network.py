@@ -77,7 +77,7 @@ class BayesNetwork(Graph):
             def leads_here(blockage_node):
                 # True if the Blockage node refers the road HERE (the vertex of evacuees)
                 return  evacuees_node.get_vertex().tag in (blockage_node.get_edge().get_v2().tag, blockage_node.get_edge().get_v1().tag)
-            relevant_blockages = filter(leads_here, blockage_nodes)
+            relevant_blockages = [blockage for blockage in blockage_nodes if leads_here(blockage)]
             for blockage in relevant_blockages:
                 self.add_bayes_edge(parent=blockage, child=evacuees_node)
 
@@ -108,9 +108,9 @@ class BayesNetwork(Graph):
 
     # returns a bayes Edge (parent) -> (child)
     def get_bayes_edge(self, parent_tag, child_tag):
-        for bayes_edge in self.get_edges():
-            if (parent_tag == bayes_edge.get_v1().tag) and (child_tag == bayes_edge.get_v2().tag):
-                return bayes_edge
+        bayes_edge = self.get_edge(parent_tag, child_tag)
+        if bayes_edge is not False:
+            return bayes_edge
         raise BaseException('did not find bayes edge for ({},{})'.format(parent_tag, child_tag))
 
     # returns a Bayes node according to it's tag (e.g. ' blockage 1 ')
@@ -119,7 +119,8 @@ class BayesNetwork(Graph):
             if node.tag.lower() == tag.lower():
                 return node
 
-    # return list of all nodes, sorted according to condition - Flooding -> Blockage -> Evacuees
+    # return list of all nodes, sorted according to condition - Flooding -> Blockage -> Evacuees.
+    # the nodes of a type are in the order they were created (nodes have no order of their own)
     def get_nodes_sorted_conditionally(self):
         floodings = []
         blockages = []
@@ -132,7 +133,7 @@ class BayesNetwork(Graph):
                 blockages.append(node)
             elif node.node_type == 'evacuees':
                 evacuees.append(node)
-        return sorted(floodings) + sorted(blockages) + sorted(evacuees)
+        return floodings + blockages + evacuees
 
 
 
@@ -1,8 +1,14 @@
 from abc import abstractmethod
+from functools import reduce
 from itertools import product
 
 LEAKAGE = 0.001
 
+
+# a probability as python 2 prints a float (12 significant digits), so the outputs don't depend on the interpreter
+def float_str(x):
+    return repr(float('%.12g' % x))
+
 class PT(object):
     def __init__(self, node_tag):
         self.node_tag = node_tag
@@ -31,7 +37,7 @@ class CPT(PT):
 
     def initialize_table(self, network):
         # an list of possible random variable mappings (?!)
-        parent_values = map(list, product([False, True], repeat=len(self.parent_tags)))
+        parent_values = [list(values) for values in product([False, True], repeat=len(self.parent_tags))]
         # edges in bayes network
         edges = [network.get_bayes_edge(parent_tag, self.node_tag) for parent_tag in self.parent_tags]
         q_values = [edge.weight for edge in edges]
@@ -40,10 +46,9 @@ class CPT(PT):
         # [ Q1  , Q2 , Q3    ]
         for bool_array in parent_values:
             # calculate product of qi's
-            qval_bool = zip(q_values, bool_array)
-            true_qs = map((lambda (q, b): q), filter(lambda (q, b): b is True, qval_bool))
-            q_product = reduce(lambda x, y: x*y, true_qs) if len(true_qs) is not 0 else 0
-            self.probability_table[tuple(bool_array)] = 1.0 - q_product if len(true_qs) is not 0 else LEAKAGE
+            true_qs = [q for q, b in zip(q_values, bool_array) if b is True]
+            q_product = reduce(lambda x, y: x*y, true_qs) if len(true_qs) != 0 else 0
+            self.probability_table[tuple(bool_array)] = 1.0 - q_product if len(true_qs) != 0 else LEAKAGE
             # if len(true_qs) is not 0:
             #     self.probability_table[tuple(bool_array)] = 1.0 - q_product
             # else:
@@ -61,12 +66,13 @@ class CPT(PT):
         s_true = ''
         s_false = ''
 
-        parent_values = self.probability_table.keys()
+        # in the order of the rows - all parents false first
+        parent_values = sorted(self.probability_table)
         for value in parent_values:
             current_prob = 'P({of}|{given}) = {value}'
             given_str = self.model_to_string(value)
-            true_value = self.get_probability(True, value)
-            false_value = self.get_probability(False, value)
+            true_value = float_str(self.get_probability(True, value))
+            false_value = float_str(self.get_probability(False, value))
             s_true += current_prob.format(of=self.node_tag, given=given_str, value=true_value) + '\n'
             s_false += current_prob.format(of='not ' + self.node_tag, given=given_str, value=false_value) + '\n'
         return s_true + s_false
@@ -88,6 +94,6 @@ class BasicPT(PT):
 
     def to_string(self):
         prob_str = 'P({of}) = {value}'
-        str_true = prob_str.format(of=self.node_tag, value=self.get_probability(True, 1))
-        str_false = prob_str.format(of='not ' + self.node_tag, value=self.get_probability(False, 1))
+        str_true = prob_str.format(of=self.node_tag, value=float_str(self.get_probability(True, 1)))
+        str_false = prob_str.format(of='not ' + self.node_tag, value=float_str(self.get_probability(False, 1)))
         return str_true + '\n' + str_false
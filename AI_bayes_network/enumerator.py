@@ -1,3 +1,6 @@
+from functools import reduce
+
+
 # list helper functions
 def first(ls):
     if not ls:
@@ -87,7 +90,7 @@ class Enumerator(object):
     # returns a P(variable| given) = ... string
     def pretty_string(self, query_value):
         evidence_list = []
-        for key in self.evidence.keys():
+        for key in sorted(self.evidence):
             evidence_list.append(key if self.evidence[key] is True else 'not ' + key)
         return 'P( {var} |  {given} ) = '.format(var=self.query_var.tag if query_value else 'not ' + self.query_var.tag,
                                                  given=', '.join(evidence_list), )
@@ -1,17 +1,52 @@
 import re
+from array import array
 
 from enumerator import MultiQuery
 from graph import Graph
+import world_cache
 
 class World(Graph):
-    def __init__(self, graph_file):
+    def __init__(self, graph_file, cache_dir=None):
         super(World, self).__init__()
         self._d = 0
         self._graph_path = graph_file
         self.shelter_vertices = []              # Shelter vertex tags
-        self.parse_file()                       # parsing given ASCII file
+        self.load(cache_dir)                    # parsing given ASCII file, or building it from its parsed record
         self.house_vertices = list(set(range(1, self._num_of_vertices + 1)) - set(self.shelter_vertices))
 
+    # build the world from the cached record of its file (world_cache.py), or parse the file and cache its record.
+    # records are kept in memory, and in files of cache_dir if given
+    def load(self, cache_dir=None):
+        key = world_cache.file_key(self._graph_path)
+        record = world_cache.lookup(key, cache_dir)
+        if record is None:
+            self.parse_file()
+            world_cache.store(key, self.to_record(), cache_dir)
+        else:
+            self.from_record(record)
+
+    # the parsed file as ints: n, if the flooding probability of every vertex was read as a float (0 for the int 0
+    # of a vertex line without F), then edge_num, a, b, w of every road. floats: the flooding probabilities
+    def to_record(self):
+        ints = [self._num_of_vertices]
+        ints.extend(int(isinstance(vertex.prob_flooding, float)) for vertex in self._vertices)
+        for edge in self._edges[::2]:   # the two directed edges of a road are added one after the other
+            ints.extend((edge.edge_num, edge.get_v1().tag, edge.get_v2().tag, edge.weight))
+        return array('i', ints), array('d', [vertex.prob_flooding for vertex in self._vertices])
+
+    def from_record(self, record):
+        ints, floats = record
+        self._num_of_vertices = ints[0]
+        for tag in range(1, self._num_of_vertices + 1):
+            prob_flooding = floats[tag - 1] if ints[tag] else 0
+            self._vertices.append(House(tag=tag, prob_flooding=prob_flooding))
+            self.adj_dict[tag] = []
+        for i in range(self._num_of_vertices + 1, len(ints), 4):
+            edge_num, w = ints[i], ints[i + 3]
+            a_vertex, b_vertex = self._vertices[ints[i + 1] - 1], self._vertices[ints[i + 2] - 1]
+            self.add_edge(Graph.Edge(edge_num, a_vertex, b_vertex, w), bi_directional=False)
+            self.add_edge(Graph.Edge(edge_num, b_vertex, a_vertex, w), bi_directional=False)
+
     def parse_file(self):
         with open(self._graph_path) as graph_file:
             lines = graph_file.readlines()
@@ -32,10 +67,9 @@ class World(Graph):
             e_lines = filter(lambda l: l.startswith('#E'), lines)
             for line in e_lines:
                 edge1, edge2 = self.parse_edge_line(line=line)
-                self._edges.append(edge1)
-                self._edges.append(edge2)
-                self.adj_dict[edge1.get_v1().tag].append(edge1.get_v2().tag)  # add adjacency
-                self.adj_dict[edge1.get_v2().tag].append(edge1.get_v1().tag)  # to both vertices of the edge
+                # one directed edge each way - together they add the adjacency to both vertices
+                self.add_edge(edge1, bi_directional=False)
+                self.add_edge(edge2, bi_directional=False)
 
     # parse D line
     def parse_deadline(self, line):
@@ -48,7 +82,7 @@ class World(Graph):
         new_line = self.remove_comments(line)
         new_line = re.sub('#V ', '', new_line)
         split_line = new_line.split(' ')
-        if len(split_line) is 3 and 'F' in new_line:
+        if len(split_line) == 3 and 'F' in new_line:
             # default probability for a flood = 0.0
             return House(tag=int(split_line[0]), prob_flooding=float(split_line[2]))
         else:
@@ -58,7 +92,7 @@ class World(Graph):
     # returns 2 edges (bi-directional)
     def parse_edge_line(self, line):
         new_line = self.remove_comments(line)
-        if len(new_line.split(' ')) is not 4:
+        if len(new_line.split(' ')) != 4:
             raise BaseException('bad line: {}'.format(new_line))
         parsed_line = re.sub('W', '', new_line)
         parsed_line = re.sub('#E', '', parsed_line)
@@ -133,7 +167,7 @@ class World(Graph):
         visited = {v: False for v in [vertex.tag for vertex in self.get_vertices()]}
         # paths_list = []
         all_paths_rec(source, visited, [])
-        return map(self.vertices_to_edge_nums_path, paths_list)
+        return [self.vertices_to_edge_nums_path(path) for path in paths_list]
 
 
     def vertices_to_edge_nums_path(self, v_path):
@@ -166,7 +200,7 @@ class World(Graph):
 
     def get_probability_path_blocked(self, path, bayes_network, reports):
         reported_evidence = reports.copy()
-        query_vars = filter(lambda n: n.get_edge().edge_num in path, bayes_network.get_nodes_of_type('blockage'))
+        query_vars = [n for n in bayes_network.get_nodes_of_type('blockage') if n.get_edge().edge_num in path]
         multi_query = MultiQuery(query_vars=query_vars, evidence=reported_evidence, network=bayes_network)
         # vars_true is False - we want blockages to be false.
         p = multi_query.query_to_value(vars_true=True)
@@ -7,6 +7,9 @@ class Graph(object):
         self._vertices = []
         self._edges = []
         self.adj_dict = {}                      # VERTEX_TAG : VERTEX ADJ'S {"1": [2, 3], "2": [1, 3, 4]}
+        self._edge_index = {}                   # (FROM VERTEX_TAG, TO VERTEX_TAG) : EDGE
+        self._incident = {}                     # VERTEX_TAG : [(ADJ VERTEX_TAG, EDGE)] sorted by the adjacent tag
+        self._parents = {}                      # VERTEX_TAG : [PARENT VERTEX] in the order the edges were added
         self._num_of_vertices = 0
         if root is not None:
             self.add_vertex(root)
@@ -21,8 +24,21 @@ class Graph(object):
     def add_edge(self, edge, bi_directional=True):
         self._edges.append(edge)
         self.adj_dict[edge.get_v1().tag].append(edge.get_v2().tag)  # add adjacency
+        self.add_incident(edge.get_v1().tag, edge.get_v2().tag, edge)
         if bi_directional:
             self.adj_dict[edge.get_v2().tag].append(edge.get_v1().tag)  # to both vertices of the edge
+            self.add_incident(edge.get_v2().tag, edge.get_v1().tag, edge)
+        # index the edge. lookups return the first edge added from v1 to v2
+        self._edge_index.setdefault((edge.get_v1().tag, edge.get_v2().tag), edge)
+        self._parents.setdefault(edge.get_v2().tag, []).append(edge.get_v1())
+
+    # insert (adjacent, edge) to the incident list of vertex, keeping it sorted by the adjacent tag
+    def add_incident(self, vertex, adjacent, edge):
+        incident = self._incident.setdefault(vertex, [])
+        i = len(incident)
+        while i > 0 and incident[i - 1][0] > adjacent:
+            i -= 1
+        incident.insert(i, (adjacent, edge))
 
     # print the adjacency dict
     def print_adjacency(self):
@@ -42,29 +58,22 @@ class Graph(object):
 
     # return the edge of (v1, v2) if exists. else, return False
     def get_edge(self, v1, v2):
-        for edge in self._edges:
-            if edge.is_equal(v1, v2):
-                return edge
-        return False
+        return self._edge_index.get((v1, v2), False)
 
-    # returns all adjacent vertices that are NOT blocked
+    # returns all adjacent vertices, sorted
     def get_adjacent_to(self, vertex):
         if isinstance(vertex, Graph.Vertex):
             vertex = vertex.tag
-        adjacent = self.adj_dict[vertex]
-        # adjacent = filter(lambda v: self.get_edge(v, vertex) is not False, adjacent)  # filter out all blocked
-        adjacent.sort()
-        return adjacent
+        return [v for v, edge in self._incident.get(vertex, ())]
 
     # get the parents of 'vertex'. if as_object is True, then Vertex objects. else, as strings (tags)
     def get_parents_of(self, vertex, as_object=True):
         if isinstance(vertex, Graph.Vertex):
             vertex = vertex.tag
-        parents = list()
-        for edge in self._edges:
-            if edge.get_v2().tag == vertex:
-                parents.append(edge.get_v1() if as_object else edge.get_v1().tag)
-        return parents
+        parents = self._parents.get(vertex, [])
+        if as_object:
+            return list(parents)
+        return [parent.tag for parent in parents]
 
 
 
@@ -75,11 +84,11 @@ class Graph(object):
 
     def get_edges(self, one_way=False):
         if one_way:
-            taken = []
+            taken = set()
             edges = []
             for edge in self._edges:
                 if edge.edge_num not in taken:
-                    taken.append(edge.edge_num)
+                    taken.add(edge.edge_num)
                     edges.append(edge)
             return edges
         return self._edges
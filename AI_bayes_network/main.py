@@ -1,29 +1,42 @@
+from __future__ import print_function
+
 import argparse
 from abc import ABCMeta
 
 import os
 from bayes_network import BayesNetwork, Evacuees, Blockage, Flooding
+from cpt import float_str
 from enumerator import Enumerator, MultiQuery
 
 from env import World
 
+try:
+    input = raw_input   # python 2 - input() would eval the line
+except NameError:
+    pass
+
+# the reports as a dict is printed, in the order of their names (string keys have no fixed order)
+def reports_as_string(reports):
+    return '{' + ', '.join('{!r}: {!r}'.format(name, reports[name]) for name in sorted(reports)) + '}'
+
+
 class Main(object):
-    def __init__(self, graph_file):
+    def __init__(self, graph_file, world_cache=None):
         self.graph_file = graph_file
-        self.world = World(graph_file=graph_file)
+        self.world = World(graph_file=graph_file, cache_dir=world_cache)
         self.deadline = self.world.get_deadline()
         self.bayes_network = BayesNetwork(world=self.world)
         self.reports = {}
 
     def clear_screen(self, stupid=False):
         if stupid:
-            print('\n') * 100
+            print('\n' * 100)
         else:
             os.system('cls' if os.name == 'nt' else 'clear')
 
     def get_numbers(self,prompt, smallest, biggest):
         while True:
-            choice = raw_input(prompt).split()
+            choice = input(prompt).split()
             if 'exit' in choice or 'quit' in choice or 'q' in choice:
                 exit()
 
@@ -53,8 +66,8 @@ class Main(object):
         iteration = 0
         while True:
             iteration += 1
-            print('\n----------------\nReported so far :  \n{}\n----------------'.format(all_reports))
-            if iteration is 1:
+            print('\n----------------\nReported so far :  \n{}\n----------------'.format(reports_as_string(all_reports)))
+            if iteration == 1:
                 report_choice = int(self.get_numbers(report_prompt, smallest=1, biggest=10)[0])
             else:
                 report_choice = int(self.get_numbers(short_report_prompt, smallest=1, biggest=10)[0])
@@ -95,7 +108,7 @@ class Main(object):
                     all_reports[report] = False
 
             elif report_choice == 7:
-                print('Overall Reported: {}'.format(all_reports))
+                print('Overall Reported: {}'.format(reports_as_string(all_reports)))
                 prompt = 'Enter a set of Edges as a path. range-({},{}) '.format(1, num_edges)
                 path = set(int(n) for n in self.get_numbers(prompt, smallest=1, biggest=num_edges))
                 if len(path) > 1:
@@ -103,22 +116,22 @@ class Main(object):
                     p = self.get_probability_path_free(path)
                     non_blocked = ', '.join(['not blockage {}'.format(str(e)) for e in path])
                     given = self.evidence_as_string(all_reports)
-                    s = 'P({of} | {given} ) = {p}'.format(of=non_blocked, given=given, p=p)
+                    s = 'P({of} | {given} ) = {p}'.format(of=non_blocked, given=given, p=float_str(p))
                     print(s)
                 else:
                     print('A single edge can computed normally')
 
             elif report_choice == 8:
-                print('Overall Reported: {}'.format(all_reports))
+                print('Overall Reported: {}'.format(reports_as_string(all_reports)))
                 self.reports = all_reports
                 self.perform_reasoning()
 
             elif report_choice == 9:
                 self.reports = all_reports
-                print('Overall Reported: {}'.format(all_reports))
+                print('Overall Reported: {}'.format(reports_as_string(all_reports)))
                 prompt = 'Enter a source Vertex and a Destination Vertex. range-({},{}) '.format(1, num_vertices)
                 user_input = [int(n) for n in self.get_numbers(prompt, smallest=1, biggest=num_vertices)]
-                if len(user_input) is not 2:
+                if len(user_input) != 2:
                     print('usage : <source> <destination>')
                 else:
                     self.reports = all_reports
@@ -155,12 +168,12 @@ class Main(object):
         for (path, prob) in zip(paths, probabilities):
             if prob >= min_path[1]:
                 min_path = (path, prob)
-            print('Path: {} , Probability(free) = {}'.format(path, prob))
+            print('Path: {} , Probability(free) = {}'.format(path, float_str(prob)))
         print('\n===========================\n')
         if min_path[1] == 0.0:
             print('all paths from {} to {} are blocked with probability 1'.format(source, destination))
         else:
-            print('Best path is : {} with probability {}'.format(min_path[0], min_path[1]))
+            print('Best path is : {} with probability {}'.format(min_path[0], float_str(min_path[1])))
 
 
     # and print
@@ -168,7 +181,7 @@ class Main(object):
         enumerator = Enumerator(query_var=node, evidence=self.reports, network=self.bayes_network)
         p = enumerator.pretty_string(query_value=True)
         p_val = enumerator.enumeration_ask()
-        s = p + str(p_val[0])
+        s = p + float_str(p_val[0])
         print(s)
         # print("\n")
         return p_val[0]
@@ -177,7 +190,7 @@ class Main(object):
 
     def get_probability_path_free(self, path):
             reported_evidence = self.reports.copy()
-            query_vars = filter(lambda n: n.get_edge().edge_num in path, self.bayes_network.get_nodes_of_type('blockage'))
+            query_vars = [n for n in self.bayes_network.get_nodes_of_type('blockage') if n.get_edge().edge_num in path]
             multi_query = MultiQuery(query_vars=query_vars, evidence=reported_evidence, network=self.bayes_network)
             # vars_true is False - we want blockages to be false.
             p = multi_query.query_to_value(vars_true=False)
@@ -186,7 +199,7 @@ class Main(object):
 
     def evidence_as_string(self, evidence):
         s = ''
-        for e in evidence.keys():
+        for e in sorted(evidence):
             if s != '':
                 s += ','
             if evidence[e]:
@@ -201,14 +214,15 @@ class Main(object):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-g', '--graph_file', default='./graph.txt')
+    parser.add_argument('--world_cache', default=None)    # directory of the parsed records of graph files
 
     args = parser.parse_args()
 
-    main = Main(graph_file=args.graph_file)
+    main = Main(graph_file=args.graph_file, world_cache=args.world_cache)
     main.print_network()
-    print '\n' * 5
+    print('\n' * 5)
     main.prompt_query_evidence()
-    print '\n' * 10
+    print('\n' * 10)
 
 
 
@@ -0,0 +1,103 @@
+# every assignment directory keeps its own copy of this module, as it does of graph.py: each one is run from its own
+# directory with flat imports (python sim.py / main.py), and there is no package above them to share a module from.
+# keep the copies the same
+import hashlib
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+FORMAT_VERSION = 1
+MAGIC = b'WRLD'
+HEADER = struct.Struct('=4sHII')    # magic, format version, number of ints, number of floats
+
+# the records of this process by the key of their graph file, so a world made again from the same file (a reset)
+# is built from memory. only the MAX_RECORDS most recently used are kept, the others are read from cache_dir again
+MAX_RECORDS = 16
+_records = OrderedDict()    # KEY : record, least recently used first
+
+
+# the key of a graph file - the sha1 of its contents
+def file_key(path):
+    with open(path, 'rb') as graph_file:
+        return hashlib.sha1(graph_file.read()).hexdigest()
+
+
+def record_path(cache_dir, key):
+    return os.path.join(cache_dir, key + '.world')
+
+
+# the parsed record (ints, floats) of a graph file - from memory, or from its file in cache_dir.
+# None if it isn't cached
+def lookup(key, cache_dir=None):
+    record = _records.pop(key, None)
+    if record is None and cache_dir is not None:
+        record = read_record(record_path(cache_dir, key))
+    if record is not None:
+        keep(key, record)
+    return record
+
+
+# keep the record of a graph file in memory, and in cache_dir if given
+def store(key, record, cache_dir=None):
+    keep(key, record)
+    if cache_dir is not None:
+        write_record(record_path(cache_dir, key), record)
+
+
+# keep record in memory as the most recently used, and drop the least recently used over MAX_RECORDS
+def keep(key, record):
+    _records.pop(key, None)
+    _records[key] = record
+    if len(_records) > MAX_RECORDS:
+        _records.popitem(last=False)
+
+
+# a record file is the header, the ints and the floats. it is read in one read - a missing file, or a file of
+# another format, is not a record
+def read_record(path):
+    try:
+        with open(path, 'rb') as record_file:
+            data = record_file.read()
+    except (IOError, OSError):
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, num_ints, num_floats = HEADER.unpack_from(data)
+    ints, floats = array('i'), array('d')
+    ints_end = HEADER.size + num_ints * ints.itemsize
+    if magic != MAGIC or version != FORMAT_VERSION or len(data) != ints_end + num_floats * floats.itemsize:
+        return None
+    from_bytes(ints, data[HEADER.size:ints_end])
+    from_bytes(floats, data[ints_end:])
+    return ints, floats
+
+
+# written to a temporary file of this process first and renamed over path, so parallel runs of the same graph
+# file never read a half written record
+def write_record(path, record):
+    ints, floats = record
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:     # made by a parallel run
+            pass
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as record_file:
+        record_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(ints), len(floats)))
+        record_file.write(to_bytes(ints))
+        record_file.write(to_bytes(floats))
+    os.rename(temp_path, path)
+
+
+# ------- arrays as bytes, on python 2 (tostring / fromstring) and python 3 (tobytes / frombytes)
+def to_bytes(values):
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
+
+
+def from_bytes(values, data):
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
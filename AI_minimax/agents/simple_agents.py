@@ -1,6 +1,13 @@
 from env import *
-from agent import Agent
+from .agent import Agent
 from ping_pong_game_tree import Node
+
+try:
+    input = raw_input   # python 2 - input() would eval the line
+except NameError:
+    pass
+
+
 class Human(Agent):
     def __init__(self, world, name=None, init_vertex=1,choice=None):
         super(Human, self).__init__(world=world, name=name, init_vertex=init_vertex)
@@ -47,7 +54,7 @@ class Human(Agent):
 
     # get the next move from the user
     def get_next_move(self):
-        return raw_input("What is your next move?\n--NOP to no-op\n--T<#Vertex> to traverse to another vertex\nInput: ").upper()
+        return input("What is your next move?\n--NOP to no-op\n--T<#Vertex> to traverse to another vertex\nInput: ").upper()
 
 
 
@@ -1,5 +1,5 @@
 from env import *
-from agent import Agent
+from .agent import Agent
 from game_tree import GameTree, infinity, minus_infinity, Node
 from ping_pong_game_tree import PingPongGameTree
 
@@ -1,16 +1,49 @@
 import re
+from array import array
 from graph import Graph
+import world_cache
 
 class World(Graph):
-    def __init__(self, graph_file, k=1):
+    def __init__(self, graph_file, k=1, cache_dir=None):
         super(World, self).__init__()
         self._k = k
         self._d = 0
         self._graph_path = graph_file
         self.shelter_vertices = []              # Shelter vertex tags
-        self.parse_file()                       # parsing given ASCII file
+        self.load(cache_dir)                    # parsing given ASCII file, or building it from its parsed record
         self.house_vertices = list(set(range(1, self._num_of_vertices + 1)) - set(self.shelter_vertices))
 
+    # build the world from the cached record of its file (world_cache.py), or parse the file and cache its record.
+    # records are kept in memory, and in files of cache_dir if given
+    def load(self, cache_dir=None):
+        key = world_cache.file_key(self._graph_path)
+        record = world_cache.lookup(key, cache_dir)
+        if record is None:
+            self.parse_file()
+            world_cache.store(key, self.to_record(), cache_dir)
+        else:
+            self.from_record(record)
+
+    # the parsed file as ints: n, d, the number of shelters, the shelter tags, the people of every vertex
+    # (-1 for a shelter), then a, b, w of every edge. no floats
+    def to_record(self):
+        ints = [self._num_of_vertices, self._d, len(self.shelter_vertices)] + self.shelter_vertices
+        ints.extend(-1 if isinstance(vertex, Shelter) else vertex.people for vertex in self._vertices)
+        for edge in self._edges:
+            ints.extend((edge.v1.tag, edge.v2.tag, edge.weight))
+        return array('i', ints), array('d')
+
+    def from_record(self, record):
+        ints = record[0]
+        self._num_of_vertices, self._d, num_shelters = ints[0], ints[1], ints[2]
+        self.shelter_vertices = list(ints[3:3 + num_shelters])
+        first_edge = 3 + num_shelters + self._num_of_vertices
+        for tag, people in enumerate(ints[3 + num_shelters:first_edge], 1):
+            self._vertices.append(Shelter(tag=tag) if people < 0 else House(tag=tag, people=people))
+            self.adj_dict[tag] = []
+        for i in range(first_edge, len(ints), 3):
+            self.add_edge(Graph.Edge(self._vertices[ints[i] - 1], self._vertices[ints[i + 1] - 1], ints[i + 2]))
+
     def parse_file(self):
         with open(self._graph_path) as graph_file:
             lines = graph_file.readlines()
@@ -34,9 +67,7 @@ class World(Graph):
             e_lines = filter(lambda l: l.startswith('#E'), lines)
             for line in e_lines:
                 edge = self.parse_edge_line(line=line)
-                self._edges.append(edge)
-                self.adj_dict[edge.v1.tag].append(edge.v2.tag)  # add adjacency
-                self.adj_dict[edge.v2.tag].append(edge.v1.tag)  # to both vertices of the edge
+                self.add_edge(edge)
 
     # parse D line
     def parse_deadline(self, line):
@@ -51,16 +82,16 @@ class World(Graph):
         split_line = new_line.split(' ')
 
         # if its a SHELTER line
-        if len(split_line) is 2 and 's' in new_line.lower():
+        if len(split_line) == 2 and 's' in new_line.lower():
             return Shelter(tag=int(split_line[0]))
         # HOUSE line
-        elif len(split_line) is 3 and 'p' in new_line.lower():
+        elif len(split_line) == 3 and 'p' in new_line.lower():
             return House(tag=int(split_line[0]), people=int(split_line[2]))
 
     # parse an Edge line -: #E 2 4 W5
     def parse_edge_line(self, line):
         new_line = self.remove_comments(line)
-        if len(new_line.split(' ')) is not 4:
+        if len(new_line.split(' ')) != 4:
             raise BaseException('bad line: {}'.format(new_line))
         parsed_line = re.sub('W', '', new_line)
         parsed_line = re.sub('#E ', '', parsed_line)
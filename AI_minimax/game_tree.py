@@ -30,7 +30,7 @@ class GameTree(Graph):
     # return the utility value according to task - Adversarial, semi-coop, coop
     def utility_value(self, utility, agent=0):
         # get the index of the playing agent
-        if agent is not 0:
+        if agent != 0:
             agent = self.agents.index(agent)
         if self.mode == 'adversarial' or isinstance(utility, int) or isinstance(utility, float):
             return utility
@@ -142,16 +142,16 @@ class GameTree(Graph):
     def isolate_sort_houses(self, vertices, world, visited=None,remove_empty_houses = False):
         def house_filter(house):
             return world.get_vertex_for_tag(house[0]).people > 0 and house[0] not in visited
-        isolated = list([key, value] for key, value in vertices.iteritems() if world.is_house(key))
+        isolated = list([key, value] for key, value in vertices.items() if world.is_house(key))
         isolated.sort(key=lambda x: x[1][0])
         if remove_empty_houses and visited is not None:
-            isolated = filter(house_filter, isolated)
+            isolated = [house for house in isolated if house_filter(house)]
 
         return isolated
 
     # isolate the houses out of all vertices of shape : (vertex, [cost, people])
     def isolate_sort_shelters(self, vertices, world):
-        isolated = list([key, value] for key, value in vertices.iteritems() if world.is_shelter(key))
+        isolated = list([key, value] for key, value in vertices.items() if world.is_shelter(key))
         isolated.sort(key=lambda x: x[1][0])
         return isolated
 
@@ -270,7 +270,7 @@ class Node(Graph.Vertex):
         self.depth = depth
         self.state = state.copy()
         self.type = 'INNER_NODE'
-        super(Node, self).__init__(gen.next())
+        super(Node, self).__init__(next(gen))
 
     def get_minimax_value(self):
         return self._minimax_value
@@ -7,6 +7,8 @@ class Graph(object):
         self._vertices = []
         self._edges = []
         self.adj_dict = {}                      # VERTEX_TAG : VERTEX ADJ'S {"1": [2, 3], "2": [1, 3, 4]}
+        self._edge_index = {}                   # (VERTEX_TAG, VERTEX_TAG) sorted pair : EDGE
+        self._incident = {}                     # VERTEX_TAG : [(ADJ VERTEX_TAG, EDGE)] sorted by the adjacent tag
         self._num_of_vertices = 0
         if root is not None:
             self.add_vertex(root)
@@ -22,6 +24,18 @@ class Graph(object):
         self._edges.append(edge)
         self.adj_dict[edge.v1.tag].append(edge.v2.tag)  # add adjacency
         self.adj_dict[edge.v2.tag].append(edge.v1.tag)  # to both vertices of the edge
+        # index the edge. lookups return the first edge added between two vertices
+        self._edge_index.setdefault(Graph.pair_key(edge.v1.tag, edge.v2.tag), edge)
+        self.add_incident(edge.v1.tag, edge.v2.tag, edge)
+        self.add_incident(edge.v2.tag, edge.v1.tag, edge)
+
+    # insert (adjacent, edge) to the incident list of vertex, keeping it sorted by the adjacent tag
+    def add_incident(self, vertex, adjacent, edge):
+        incident = self._incident.setdefault(vertex, [])
+        i = len(incident)
+        while i > 0 and incident[i - 1][0] > adjacent:
+            i -= 1
+        incident.insert(i, (adjacent, edge))
 
     # print the adjacency dict
     def print_adjacency(self):
@@ -39,20 +53,29 @@ class Graph(object):
 
     # return the edge of (v1, v2) if exists. else, return False
     def get_edge(self, v1, v2):
-        for edge in self._edges:
-            if edge.is_equal(v1, v2):
-                if not edge.blocked:
-                    return edge
-                return False
+        edge = self._edge_index.get(Graph.pair_key(v1, v2))
+        if edge is None:
+            return None
+        if not edge.blocked:
+            return edge
+        return False
 
     # returns all adjacent vertices that are NOT blocked
     def get_adjacent_to(self, vertex):
         if isinstance(vertex, Graph.Vertex):
             vertex = vertex.tag
-        adjacent = self.adj_dict[vertex]
-        adjacent = filter(lambda v: self.get_edge(v, vertex) is not False, adjacent)  # filter out all blocked
-        adjacent.sort()
-        return adjacent
+        return [v for v, edge in self._incident.get(vertex, ()) if not edge.blocked]
+
+    # returns (adjacent vertex, edge) for all edges of vertex that are NOT blocked, sorted by the adjacent vertex
+    def get_adjacent_edges(self, vertex):
+        if isinstance(vertex, Graph.Vertex):
+            vertex = vertex.tag
+        return [(v, edge) for v, edge in self._incident.get(vertex, ()) if not edge.blocked]
+
+    # key of an undirected edge between two vertex tags
+    @staticmethod
+    def pair_key(v1, v2):
+        return (v1, v2) if v1 <= v2 else (v2, v1)
 
 
     # describes an edge on the graph
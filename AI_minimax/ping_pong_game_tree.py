@@ -252,7 +252,7 @@ class Node(Graph.Vertex):
         self.depth = depth
         self.state = state.copy()
         self.type = 'INNER_NODE'
-        super(Node, self).__init__(gen.next())
+        super(Node, self).__init__(next(gen))
 
     def get_minimax_value(self):
         return self._minimax_value
@@ -7,6 +7,11 @@ from agents.smart_agents import GameTreeAgent
 from env import World
 from game_tree import GameTree
 
+try:
+    input = raw_input   # python 2 - input() would eval the line
+except NameError:
+    pass
+
 
 class Simulator:
     __metaclass__ = ABCMeta
@@ -17,14 +22,14 @@ class Simulator:
 
 
 class HurricaneGameSimulator(Simulator):
-    def __init__(self, graph_file, agent_file, cutoff_depth, ping_pong, mode='adversarial'):
+    def __init__(self, graph_file, agent_file, cutoff_depth, ping_pong, mode='adversarial', world_cache=None):
         self.ping_pong = ping_pong
         self.graph_file = graph_file
         self.time = 0             # track time of the world
         self.evacuated = 0        # total number of people evacuated
         self.agents_history = []  # search paths of smart agents
         self.cutoff_depth = int(cutoff_depth)
-        self.world = World(graph_file=graph_file, k=self.prompt_k())
+        self.world = World(graph_file=graph_file, k=self.prompt_k(), cache_dir=world_cache)
         self.deadline = self.world.get_deadline()
         self.agents = self.get_agents_data(agent_file=agent_file, world=self.world)
         self.init_state = self.create_init_states(self.world, self.agents)
@@ -135,14 +140,14 @@ class HurricaneGameSimulator(Simulator):
         for i in range(len(state_path))[1:]:
             in_car = state_path[i].get_people_in_car()
             # if 0 people in car, it means last state was a drop-off
-            if in_car is 0:
+            if in_car == 0:
                 score += state_path[i - 1].get_people_in_car()
         return score
 
 
     def print_run(self):
 
-        if len(self.agents_history) is 0:
+        if len(self.agents_history) == 0:
             print('Nothing to print!')
             return
         for agent, state_path in self.agents_history:
@@ -171,7 +176,7 @@ class HurricaneGameSimulator(Simulator):
         print('initial state : {}'.format(self.game_tree.root.get_state()))
         node = self.game_tree.root
         i = 0           # first agent to "run"
-        while node.type is not 'CUTOFF' and node.type is not 'TERMINAL':
+        while node.type != 'CUTOFF' and node.type != 'TERMINAL':
             agent = self.agents[i]
             action = agent.get_move(node)
             # update to next node
@@ -230,17 +235,18 @@ if __name__ == '__main__':
     parser.add_argument('-p', '--ping_pong', default=False)
     parser.add_argument('-t', '--task_number', default='1')
     parser.add_argument('-c', '--cutoff_depth', default=15)
+    parser.add_argument('--world_cache', default=None)    # directory of the parsed records of graph files
 
     args = parser.parse_args()
 
     # ping pong - each agent creates a new tree every turn
     ping_pong = True if (str(args.ping_pong).lower() == 'y' or str(args.ping_pong).lower() == 'yes') else False
-    if int(args.task_number) is 1:
-        sim = HurricaneGameSimulator(graph_file=args.graph_file, agent_file=args.agent_file, mode='adversarial', cutoff_depth=args.cutoff_depth, ping_pong=ping_pong)
-    elif int(args.task_number) is 2:
-        sim = HurricaneGameSimulator(graph_file=args.graph_file, agent_file=args.agent_file, mode='semi-coop', cutoff_depth=args.cutoff_depth, ping_pong=ping_pong)
+    if int(args.task_number) == 1:
+        sim = HurricaneGameSimulator(graph_file=args.graph_file, agent_file=args.agent_file, mode='adversarial', cutoff_depth=args.cutoff_depth, ping_pong=ping_pong, world_cache=args.world_cache)
+    elif int(args.task_number) == 2:
+        sim = HurricaneGameSimulator(graph_file=args.graph_file, agent_file=args.agent_file, mode='semi-coop', cutoff_depth=args.cutoff_depth, ping_pong=ping_pong, world_cache=args.world_cache)
     else: #if 'full-coop'
-        sim = HurricaneGameSimulator(graph_file=args.graph_file, agent_file=args.agent_file, mode='full-coop', cutoff_depth=args.cutoff_depth, ping_pong=ping_pong)
+        sim = HurricaneGameSimulator(graph_file=args.graph_file, agent_file=args.agent_file, mode='full-coop', cutoff_depth=args.cutoff_depth, ping_pong=ping_pong, world_cache=args.world_cache)
     if ping_pong:
         sim.run_ping_pong()
     else:
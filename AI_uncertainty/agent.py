@@ -29,8 +29,8 @@ class PlanningAgent(Agent):
     # The agent's only actions are traveling between vertices.
     def do(self):
         states = self.belief_space.states
-        successors = self.state.successors.values()
-        successors = [item for sublist in successors for item in sublist]
+        # by location, so ties are broken the same way whatever the order of the dict
+        successors = [item for location in sorted(self.state.successors) for item in self.state.successors[location]]
 
         if len(successors) == 0:
             return self.state
@@ -14,7 +14,7 @@ class BeliefSpace(object):
         # init state
         all_init_states = self.belief_state_list(location=init_vertex, time=0)
 
-        legal = filter(lambda state: state.saved == 0 and state.evacuees == self.get_init_evacs()[0], all_init_states)
+        legal = [state for state in all_init_states if state.saved == 0 and state.evacuees == self.get_init_evacs()[0]]
         self.init_states += legal
 
         self.states += legal
@@ -69,12 +69,13 @@ class BeliefSpace(object):
                     if blocked_possibility == {}:
                         continue
 
-                    new_blocked = dict(blocked_possibility, ** dict(state.blocked_edges))
+                    new_blocked = dict(blocked_possibility)
+                    new_blocked.update(state.blocked_edges)
                     s = BeliefState(new_location, new_blocked, new_carrying, new_evacs, new_saved, new_time)
                     # add successor
                     successors.append(s)
 
-                if len(dict_block) is 0 or dict_block == [{}]:
+                if len(dict_block) == 0 or dict_block == [{}]:
                     s = BeliefState(new_location, dict(state.blocked_edges), new_carrying, new_evacs, new_saved, new_time)
                     # add successor
                     successors.append(s)
@@ -108,23 +109,22 @@ class BeliefSpace(object):
         return states
 
     def get_init_evacs(self):
-        evacables = map(lambda v : v.tag, filter(lambda v: v.evac > 0, self.world.get_vertices()))
-        evac_attrs = set(product({True}, repeat=len(evacables)))
+        evacables = [v.tag for v in self.world.get_vertices() if v.evac > 0]
+        evac_attrs = list(product([True], repeat=len(evacables)))
         return [dict(zip(evacables, attr)) for attr in evac_attrs]
 
     def get_possible_evacs(self):
-        evacables = map(lambda v : v.tag, filter(lambda v: v.evac > 0, self.world.get_vertices()))
-        evac_attrs = set(product({True, False}, repeat=len(evacables)))
+        evacables = [v.tag for v in self.world.get_vertices() if v.evac > 0]
+        evac_attrs = list(product([False, True], repeat=len(evacables)))
         return [dict(zip(evacables, attr)) for attr in evac_attrs]
 
     def get_possible_blocked(self, location, e_nums_to_ignore=[]):
         adj = self.world.get_adjacent_to(location)
         adj_edges = [self.world.get_edge(location, v) for v in adj]
-        adj_edges_filters = filter(lambda e: e.edge_num not in e_nums_to_ignore, adj_edges)
-        blockables = filter(lambda x: x.prob_blockage > 0, adj_edges_filters)
+        blockables = [e for e in adj_edges if e.edge_num not in e_nums_to_ignore and e.prob_blockage > 0]
 
-        blockables_tag = map(lambda e: e.edge_num, blockables)
-        blockable_attrs = set(product({True, False}, repeat=len(blockables)))
+        blockables_tag = [e.edge_num for e in blockables]
+        blockable_attrs = list(product([False, True], repeat=len(blockables)))
         # filter this from all NON BLOCKED edges
         tag_to_option = [dict(zip(blockables_tag, attr)) for attr in blockable_attrs]
         return tag_to_option
@@ -1,16 +1,57 @@
 import re
+from array import array
 
 from graph import Graph
+import world_cache
 
 class World(Graph):
-    def __init__(self, graph_file):
+    def __init__(self, graph_file, cache_dir=None):
         super(World, self).__init__()
         self._d = 0
         self._graph_path = graph_file
         self.shelter_vertex = None                # only one shelter at vertex t
-        self.parse_file()                       # parsing given ASCII file
+        self.load(cache_dir)                    # parsing given ASCII file, or building it from its parsed record
 
 
+    # build the world from the cached record of its file (world_cache.py), or parse the file and cache its record.
+    # records are kept in memory, and in files of cache_dir if given
+    def load(self, cache_dir=None):
+        key = world_cache.file_key(self._graph_path)
+        record = world_cache.lookup(key, cache_dir)
+        if record is None:
+            self.parse_file()
+            world_cache.store(key, self.to_record(), cache_dir)
+        else:
+            self.from_record(record)
+
+    # the parsed file as ints: n, d, the shelter tag, the evacuees of every vertex, then edge_num, a, b, w of every
+    # road and if it has a blockage probability (0 for the int 0 of a road line without B).
+    # floats: the blockage probabilities of the roads
+    def to_record(self):
+        ints = [self._num_of_vertices, self._d, self.shelter_vertex.tag]
+        ints.extend(vertex.evac for vertex in self._vertices)
+        floats = []
+        for edge in self._edges[::2]:   # the two directed edges of a road are added one after the other
+            ints.extend((edge.edge_num, edge.get_v1().tag, edge.get_v2().tag, edge.weight,
+                         int(isinstance(edge.prob_blockage, float))))
+            floats.append(edge.prob_blockage)
+        return array('i', ints), array('d', floats)
+
+    def from_record(self, record):
+        ints, floats = record
+        self._num_of_vertices, self._d = ints[0], ints[1]
+        self.shel0ter_vertex = self.shelter_vertex = Shelter(tag=ints[2])
+        for tag in range(1, self._num_of_vertices + 1):
+            self._vertices.append(House(tag=tag, evac=ints[2 + tag]))
+            self.adj_dict[tag] = []
+        first_edge = 3 + self._num_of_vertices
+        for road, i in enumerate(range(first_edge, len(ints), 5)):
+            edge_num, w = ints[i], ints[i + 3]
+            a_vertex, b_vertex = self._vertices[ints[i + 1] - 1], self._vertices[ints[i + 2] - 1]
+            pr_blockage = floats[road] if ints[i + 4] else 0
+            self.add_edge(Graph.Edge(edge_num, a_vertex, b_vertex, w, pr_blockage), bi_directional=False)
+            self.add_edge(Graph.Edge(edge_num, b_vertex, a_vertex, w, pr_blockage), bi_directional=False)
+
     def parse_file(self):
         with open(self._graph_path) as graph_file:
             lines = graph_file.readlines()
@@ -33,10 +74,9 @@ class World(Graph):
             e_lines = filter(lambda l: l.startswith('#E'), lines)
             for line in e_lines:
                 edge1, edge2 = self.parse_edge_line(line=line)
-                self._edges.append(edge1)
-                self._edges.append(edge2)
-                self.adj_dict[edge1.get_v1().tag].append(edge1.get_v2().tag)  # add adjacency
-                self.adj_dict[edge1.get_v2().tag].append(edge1.get_v1().tag)  # to both vertices of the edge
+                # one directed edge each way - together they add the adjacency to both vertices
+                self.add_edge(edge1, bi_directional=False)
+                self.add_edge(edge2, bi_directional=False)
             #starting_line = filter(lambda l: l.startswith('#Start'), lines)[0]
 
 
@@ -72,7 +112,7 @@ class World(Graph):
         parsed_line = re.sub('#E', '', new_line)
         parsed_line = re.sub('W', '', parsed_line)
         # #E1 1 2 W3
-        if len(new_line.split(' ')) is 4:
+        if len(new_line.split(' ')) == 4:
             edge_num, a, b, w = map(int, parsed_line.split(' '))
             a_vertex = self._vertices[a - 1]
             b_vertex = self._vertices[b - 1]
@@ -151,7 +191,7 @@ class World(Graph):
         visited = {v: False for v in [vertex.tag for vertex in self.get_vertices()]}
         # paths_list = []
         all_paths_rec(source, visited, [])
-        return map(self.vertices_to_edge_nums_path, paths_list)
+        return [self.vertices_to_edge_nums_path(path) for path in paths_list]
 
 
     def vertices_to_edge_nums_path(self, v_path):
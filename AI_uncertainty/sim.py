@@ -9,9 +9,9 @@ import random
 
 
 class HurricaneEvacuationSimulator(object):
-    def __init__(self, graph_file, start_vertex):
+    def __init__(self, graph_file, start_vertex, world_cache=None):
         self.graph_file = graph_file
-        self.world = World(graph_file=graph_file)
+        self.world = World(graph_file=graph_file, cache_dir=world_cache)
         self.deadline = self.world.get_deadline()
         self.shelter_tag = self.world.get_shelter_tag()
         # create agent
@@ -22,7 +22,7 @@ class HurricaneEvacuationSimulator(object):
 
         self.val_iterator = ValueIteration(self.belief_space, self.world)
         self.utilities = self.val_iterator.value_iteration()
-        print(self.utilities.values())
+        print([self.utilities[s] for s in self.belief_space.states])
 
 
 
@@ -37,16 +37,16 @@ class HurricaneEvacuationSimulator(object):
     # generate all possible blockage combinations
     def all_blockage_instances(self):
         # edge that can be blocked
-        maybe_blocked = map(lambda e: e.edge_num, filter(lambda e: e.prob_blockage > 0, self.world.get_edges(one_way=True)))
-        blockages = set(product({True, False}, repeat=len(maybe_blocked)))
+        maybe_blocked = [e.edge_num for e in self.world.get_edges(one_way=True) if e.prob_blockage > 0]
+        blockages = list(product([False, True], repeat=len(maybe_blocked)))
         return [dict(zip(maybe_blocked, blockage)) for blockage in blockages]
 
     def random_blockage(self):
         # blockable edges
-        blockables = map(lambda e: e.edge_num, filter(lambda e : e.prob_blockage > 0,self.world.get_edges(one_way=True)))
+        blockables = [e.edge_num for e in self.world.get_edges(one_way=True) if e.prob_blockage > 0]
         # NONE at first
         blockage_dict = {key: None for key in blockables}
-        for e in blockage_dict:
+        for e in sorted(blockage_dict):
             prob = self.world.get_edge_for_num(e).prob_blockage
             blockage_dict[e] = self.true_in_prob(prob)
 
@@ -66,7 +66,7 @@ class HurricaneEvacuationSimulator(object):
             blockage_instance = self.random_blockage()
             init_states = self.belief_space.init_states
             # remove from init state/s
-            init_state = filter(lambda d: self.consistent_state(d, blockage_instance), init_states)[0]
+            init_state = [d for d in init_states if self.consistent_state(d, blockage_instance)][0]
             init_s = init_state
             agent = PlanningAgent(world=self.world, belief_space=self.belief_space, utilities=self.utilities, \
                                   init_state=init_state, init_vertex=self.start_vertex, blockage=blockage_instance)
@@ -103,9 +103,11 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-g', '--graph_file', default='./graph.txt')
     parser.add_argument('-s', '--start_vertex', default=1)
+    parser.add_argument('--world_cache', default=None)    # directory of the parsed records of graph files
     args = parser.parse_args()
 
-    simulator = HurricaneEvacuationSimulator(graph_file=args.graph_file, start_vertex=int(args.start_vertex))
+    simulator = HurricaneEvacuationSimulator(graph_file=args.graph_file, start_vertex=int(args.start_vertex),
+                                             world_cache=args.world_cache)
     simulator.world.print_graph()
 
     simulator.run_an_agent()